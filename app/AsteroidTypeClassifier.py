@@ -2,183 +2,83 @@
 # ASTEROID TYPE CLASSIFIER
 # =============================
 
-import random
-from typing import Dict
+import json
+from array import array
+from pathlib import Path
+from types import MappingProxyType
+from typing import Dict, Iterable, List
+import numpy as np
+
+from app.hashing import splitmix64, splitmix64_array
+
+ASTEROID_TYPES_PATH = Path(__file__).parent / "asteroid_types.json"
 
 class AsteroidTypeClassifier:
     """Classify asteroids by spectral type with corresponding images"""
     
-    ASTEROID_TYPES = {
-        "C": {
-            "name": "C-type (Carbonaceous)",
-            "description": "Dark, carbon-rich asteroids. Most common in outer belt.",
-            "albedo_range": (0.03, 0.10),
-            "image_url": "/static/images/asteroids/c-type.jpg",
-            "characteristics": ["Very dark", "Carbon-rich", "Primitive composition"],
-            "composition": "Carbon, water ice, organic compounds"
-        },
-        "S": {
-            "name": "S-type (Silicaceous)",
-            "description": "Stony, silicate-rich asteroids. Common in inner belt.",
-            "albedo_range": (0.10, 0.22),
-            "image_url": "/static/images/asteroids/s-type.jpg",
-            "characteristics": ["Moderate brightness", "Silicate minerals", "Rocky"],
-            "composition": "Iron, magnesium silicates"
-        },
-        "M": {
-            "name": "M-type (Metallic)",
-            "description": "Metal-rich asteroids, possibly exposed cores.",
-            "albedo_range": (0.10, 0.18),
-            "image_url": "/static/images/asteroids/m-type.jpg",
-            "characteristics": ["Metal-rich", "High density", "Nickel-iron"],
-            "composition": "Iron, nickel, cobalt"
-        },
-        "V": {
-            "name": "V-type (Vesta-like)",
-            "description": "Basaltic composition, similar to asteroid Vesta.",
-            "albedo_range": (0.30, 0.50),
-            "image_url": "/static/images/asteroids/v-type.jpg",
-            "characteristics": ["Very bright", "Basaltic", "Differentiated"],
-            "composition": "Basalt, pyroxene"
-        },
-        "B": {
-            "name": "B-type",
-            "description": "Similar to C-type but slightly brighter.",
-            "albedo_range": (0.04, 0.08),
-            "image_url": "/static/images/asteroids/b-type.jpg",
-            "characteristics": ["Dark", "Primitive", "Carbon-bearing"],
-            "composition": "Carbonaceous materials"
-        },
-        "Q": {
-            "name": "Q-type",
-            "description": "Similar to ordinary chondrite meteorites.",
-            "albedo_range": (0.15, 0.30),
-            "image_url": "/static/images/asteroids/q-type.jpg",
-            "characteristics": ["Fresh surface", "Unweathered", "Stony"],
-            "composition": "Olivine, pyroxene, metal"
-        },
-        "K": {
-            "name": "K-type",
-            "description": "Intermediate between C and S types.",
-            "albedo_range": (0.08, 0.15),
-            "image_url": "/static/images/asteroids/k-type.jpg",
-            "characteristics": ["Moderate reflectance", "Mixed composition"],
-            "composition": "Mixed silicates and carbonaceous materials"
-        },
-        "D": {
-            "name": "D-type",
-            "description": "Very dark, organic-rich asteroids.",
-            "albedo_range": (0.02, 0.05),
-            "image_url": "/static/images/asteroids/d-type.jpg",
-            "characteristics": ["Extremely dark", "Organic-rich"],
-            "composition": "Organic compounds, water ice"
-        },
-        "P": {
-            "name": "P-type",
-            "description": "Similar to D-type, very dark and red.",
-            "albedo_range": (0.02, 0.06),
-            "image_url": "/static/images/asteroids/p-type.jpg",
-            "characteristics": ["Very dark", "Reddish", "Primitive"],
-            "composition": "Organic materials, silicates"
-        },
-        "R": {
-            "name": "R-type",
-            "description": "Rich in olivine, relatively rare.",
-            "albedo_range": (0.20, 0.40),
-            "image_url": "/static/images/asteroids/r-type.jpg",
-            "characteristics": ["Olivine-rich", "Bright", "Uncommon"],
-            "composition": "Olivine, pyroxene"
-        },
-        "T": {
-            "name": "T-type",
-            "description": "Moderately red, similar to D and P types.",
-            "albedo_range": (0.03, 0.07),
-            "image_url": "/static/images/asteroids/t-type.jpg",
-            "characteristics": ["Dark", "Reddish", "Trojan asteroids"],
-            "composition": "Organic materials"
-        },
-        "A": {
-            "name": "A-type",
-            "description": "Olivine-dominated, very rare.",
-            "albedo_range": (0.15, 0.30),
-            "image_url": "/static/images/asteroids/a-type.jpg",
-            "characteristics": ["Olivine-rich", "Differentiated", "Extremely rare"],
-            "composition": "Pure olivine"
-        },
-        "L": {
-            "name": "L-type",
-            "description": "Similar to K-type, moderate albedo.",
-            "albedo_range": (0.08, 0.18),
-            "image_url": "/static/images/asteroids/l-type.jpg",
-            "characteristics": ["Moderate brightness", "Mixed composition"],
-            "composition": "Mixed materials"
-        },
-        "F": {
-            "name": "F-type",
-            "description": "Similar to B-type, carbon-rich.",
-            "albedo_range": (0.03, 0.06),
-            "image_url": "/static/images/asteroids/f-type.jpg",
-            "characteristics": ["Dark", "Carbonaceous"],
-            "composition": "Carbon compounds"
-        },
-        "G": {
-            "name": "G-type",
-            "description": "Similar to C-type with UV absorption.",
-            "albedo_range": (0.05, 0.09),
-            "image_url": "/static/images/asteroids/g-type.jpg",
-            "characteristics": ["Dark", "Carbonaceous", "UV absorption"],
-            "composition": "Carbonaceous materials with organics"
-        },
-        "U": {
-            "name": "U-type (Unclassified)",
-            "description": "Does not fit standard classifications.",
-            "albedo_range": (0.0, 1.0),
-            "image_url": "/static/images/asteroids/u-type.jpg",
-            "characteristics": ["Unusual spectrum", "Rare"],
-            "composition": "Variable"
-        },
-        "UNKNOWN": {
-            "name": "Unknown/Unclassified",
-            "description": "Spectral type not determined.",
-            "albedo_range": (0.0, 1.0),
-            "image_url": "/static/images/asteroids/unknown.jpg",
-            "characteristics": ["Classification pending", "Insufficient data"],
-            "composition": "Unknown"
-        }
-    }
+    # Loaded from asteroid_types.json (shared with the frontend) and frozen:
+    # records are read-only views and their lists become tuples
+    ASTEROID_TYPES = MappingProxyType({
+        type_code: MappingProxyType({
+            key: tuple(value) if isinstance(value, list) else value
+            for key, value in type_info.items()
+        })
+        for type_code, type_info in json.loads(ASTEROID_TYPES_PATH.read_text(encoding="utf-8")).items()
+    })
     
-    def classify_by_id(self, asteroid_id: int) -> str:
-        """Classify asteroid using deterministic pseudo-random selection"""
-        random.seed(asteroid_id)
-        
-        type_distribution = [
-            ("S", 45), ("C", 30), ("M", 5), ("Q", 5),
-            ("V", 3), ("B", 2), ("K", 2), ("D", 2),
-            ("P", 2), ("R", 1), ("T", 1), ("A", 1), ("L", 1)
-        ]
-        
-        total = sum(weight for _, weight in type_distribution)
-        rand_val = random.randint(1, total)
-        
-        cumulative = 0
-        for type_code, weight in type_distribution:
-            cumulative += weight
-            if rand_val <= cumulative:
-                random.seed()
-                return type_code
+    # Spectral type frequencies (percent) used for statistical classification
+    _TYPE_DISTRIBUTION = (
+        ("S", 45), ("C", 30), ("M", 5), ("Q", 5),
+        ("V", 3), ("B", 2), ("K", 2), ("D", 2),
+        ("P", 2), ("R", 1), ("T", 1), ("A", 1), ("L", 1)
+    )
+    _TOTAL_WEIGHT = 100
+    
+    def __init__(self):
+        # Integer weights: expand into one slot per possible draw so that
+        # sampling is a single table index instead of a cumulative scan
+        self._codes = tuple(type_code for type_code, _ in self._TYPE_DISTRIBUTION)
+        self._draw_table = array("B", (
+            index
+            for index, (_, weight) in enumerate(self._TYPE_DISTRIBUTION)
+            for _ in range(weight)
+        ))
+        self._draw_array = np.frombuffer(self._draw_table, dtype=np.uint8)
+        self._infos = tuple(self.ASTEROID_TYPES[type_code] for type_code in self._codes)
         
-        random.seed()
-        return "UNKNOWN"
+        # classify_asteroid depends only on the drawn type: build each result once
+        self._classifications = tuple(
+            self._build_classification(type_code, type_info)
+            for type_code, type_info in zip(self._codes, self._infos)
+        )
+    
+    def _sample_index(self, asteroid_id: int) -> int:
+        """Index into _codes/_infos for this asteroid"""
+        return self._draw_table[splitmix64(asteroid_id) % self._TOTAL_WEIGHT]
+    
+    def classify_by_id(self, asteroid_id: int) -> str:
+        """Classify asteroid using a deterministic hash of its id"""
+        return self._codes[self._sample_index(asteroid_id)]
     
     def get_type_info(self, type_code: str) -> Dict:
         """Get complete information for an asteroid type"""
         return self.ASTEROID_TYPES.get(type_code, self.ASTEROID_TYPES["UNKNOWN"])
     
     def classify_asteroid(self, asteroid_id: int) -> Dict:
-        """Classify asteroid and return full information"""
-        type_code = self.classify_by_id(asteroid_id)
-        type_info = self.get_type_info(type_code)
-        
+        """Classify asteroid and return full information (shared cached dict, do not mutate)"""
+        return self._classifications[self._sample_index(asteroid_id)]
+    
+    def _sample_indices(self, ids: np.ndarray) -> np.ndarray:
+        """_sample_index for an int64 array of ids"""
+        return self._draw_array[splitmix64_array(ids) % np.uint64(self._TOTAL_WEIGHT)]
+    
+    def classify_asteroid_batch(self, asteroid_ids: Iterable[int]) -> List[Dict]:
+        """classify_asteroid for many ids at once (shared cached dicts, do not mutate)"""
+        ids = np.asarray(asteroid_ids, dtype=np.int64).reshape(-1)
+        classifications = self._classifications
+        return [classifications[index] for index in self._sample_indices(ids).tolist()]
+    
+    def _build_classification(self, type_code: str, type_info: Dict) -> Dict:
         return {
             "type_code": type_code,
             "type_name": type_info["name"],
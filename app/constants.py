@@ -0,0 +1,4 @@
+# Astronomical unit in km
+AU_KM = 149597870.7
+# Its inverse, so single conversions are a multiply instead of a divide
+INV_AU_KM = 1.0 / AU_KM
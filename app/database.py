@@ -1,17 +1,50 @@
 import sqlite3
+import threading
 import pandas as pd
 from typing import List, Optional
 from app.models import Asteroid
 from app.config import Config
+from app.constants import AU_KM
 
 class AsteroidDB:
+    # أنواع الأعمدة معروفة مسبقاً فلا حاجة لأن يستنتجها pandas عند كل قراءة
+    COLUMN_DTYPES = {
+        'id': 'int64',
+        'name': 'object',
+        'date': 'object',
+        'diameter_avg': 'float64',
+        'velocity_km_s': 'float64',
+        'miss_distance_km': 'float64',
+        'energy_megatons_TNT': 'float64',
+        'is_potentially_hazardous': 'int64',
+        'created_at': 'object',
+        'distance_au': 'float64',
+    }
+    
     def __init__(self, db_path=None):
         self.db_path = db_path or Config.DB_PATH
+        self._local = threading.local()
+        # يزداد مع كل كتابة، لتعرف النتائج المخزنة مؤقتاً متى تصبح قديمة
+        self.version = 0
         self.init_database()
     
+    def _conn(self) -> sqlite3.Connection:
+        """اتصال واحد لكل thread يُعاد استخدامه بدل فتح اتصال جديد لكل استعلام"""
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = self._open()
+        return conn
+    
+    def _open(self) -> sqlite3.Connection:
+        conn = sqlite3.connect(str(self.db_path))
+        conn.execute('PRAGMA synchronous=NORMAL')
+        conn.execute('PRAGMA cache_size=-65536')  # 64 MiB
+        self._local.conn = conn
+        return conn
+    
     def init_database(self):
         """إنشاء قاعدة البيانات والجداول"""
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._conn()
         cursor = conn.cursor()
         
         cursor.execute('''
@@ -24,16 +57,27 @@ class AsteroidDB:
                 miss_distance_km REAL,
                 energy_megatons_TNT REAL,
                 is_potentially_hazardous BOOLEAN,
-                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP
+                created_at TIMESTAMP DEFAULT CURRENT_TIMESTAMP,
+                distance_au REAL
             )
         ''')
         
+        # قواعد قديمة بدون distance_au: إضافة العمود وحسابه مرة واحدة
+        existing_columns = {row[1] for row in cursor.execute('PRAGMA table_info(asteroids)')}
+        if 'distance_au' not in existing_columns:
+            cursor.execute('ALTER TABLE asteroids ADD COLUMN distance_au REAL')
+            cursor.execute('UPDATE asteroids SET distance_au = miss_distance_km / ?', (AU_KM,))
+            conn.commit()
+        
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_date ON asteroids(date)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_hazardous ON asteroids(is_potentially_hazardous)')
         cursor.execute('CREATE INDEX IF NOT EXISTS idx_energy ON asteroids(energy_megatons_TNT)')
+        cursor.execute('CREATE INDEX IF NOT EXISTS idx_diam_dist ON asteroids(diameter_avg, miss_distance_km)')
+        
+        # WAL يبقى مفعلاً في ملف القاعدة ويقلل عمليات fsync عند الكتابة
+        cursor.execute('PRAGMA journal_mode=WAL')
         
         conn.commit()
-        conn.close()
         print(f"✅ Database initialized: {self.db_path}")
     
     def load_from_csv(self, csv_path):
@@ -49,63 +93,85 @@ class AsteroidDB:
                     (df['miss_distance_km'] <= 7479893.535)  # 0.05 AU
                 )
             
-            conn = sqlite3.connect(str(self.db_path))
+            # المسافة بالوحدة الفلكية تُحسب مرة واحدة هنا بدل كل طلب
+            df['distance_au'] = df['miss_distance_km'] / AU_KM
+            
+            rows = df[[
+                'id', 'name', 'date', 'diameter_avg', 'velocity_km_s',
+                'miss_distance_km', 'energy_megatons_TNT', 'is_potentially_hazardous',
+                'distance_au'
+            ]].itertuples(index=False, name=None)
+            
+            conn = self._conn()
             
-            for _, row in df.iterrows():
-                conn.execute('''
-                    INSERT OR REPLACE INTO asteroids 
-                    (id, name, date, diameter_avg, velocity_km_s, miss_distance_km, 
-                     energy_megatons_TNT, is_potentially_hazardous)
-                    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-                ''', (
-                    row['id'], row['name'], row['date'],
-                    row['diameter_avg'], row['velocity_km_s'],
-                    row['miss_distance_km'], row['energy_megatons_TNT'],
-                    row.get('is_potentially_hazardous', False)
-                ))
+            # إدخال كل الصفوف بعبارة واحدة داخل معاملة واحدة
+            conn.executemany('''
+                INSERT OR REPLACE INTO asteroids 
+                (id, name, date, diameter_avg, velocity_km_s, miss_distance_km, 
+                 energy_megatons_TNT, is_potentially_hazardous, distance_au)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)
+            ''', rows)
             
             conn.commit()
-            conn.close()
+            self.version += 1
             print(f"✅ Inserted {len(df)} asteroids into database")
             return True
         except Exception as e:
+            # الاتصال مشترك، فلا نترك معاملة نصف منفذة مفتوحة عليه
+            self._conn().rollback()
             print(f"❌ Error loading CSV: {e}")
             return False
     
-    def get_all_asteroids(self) -> pd.DataFrame:
-        conn = sqlite3.connect(str(self.db_path))
-        df = pd.read_sql_query("SELECT * FROM asteroids ORDER BY date", conn)
-        conn.close()
+    def get_all_asteroids(self, columns: Optional[List[str]] = None) -> pd.DataFrame:
+        """كل الكويكبات، مع إمكانية جلب أعمدة محددة فقط من SQL"""
+        columns = columns or list(self.COLUMN_DTYPES)
+        unknown = set(columns) - self.COLUMN_DTYPES.keys()
+        if unknown:
+            raise ValueError(f"Unknown asteroid columns: {sorted(unknown)}")
+        
+        conn = self._conn()
+        df = pd.read_sql_query(
+            f"SELECT {', '.join(columns)} FROM asteroids ORDER BY date",
+            conn,
+            dtype={column: self.COLUMN_DTYPES[column] for column in columns}
+        )
         return df
     
+    def change_token(self) -> tuple:
+        """بصمة لمحتوى الجدول تتغير مع كتابات هذه العملية وكتابات العمليات الأخرى
+        (عدد الصفوف وأحدث created_at)، لتعرف النتائج المخزنة مؤقتاً متى تصبح قديمة"""
+        count, latest = self._conn().execute(
+            "SELECT COUNT(*), MAX(created_at) FROM asteroids"
+        ).fetchone()
+        return (self.version, count, latest)
+    
     def get_dangerous_asteroids(self, min_diameter=140, max_distance_au=0.05) -> pd.DataFrame:
-        max_distance_km = max_distance_au * 149597870.7
-        conn = sqlite3.connect(str(self.db_path))
-        query = f'''
+        max_distance_km = max_distance_au * AU_KM
+        conn = self._conn()
+        query = '''
             SELECT * FROM asteroids 
-            WHERE diameter_avg >= {min_diameter} 
-            AND miss_distance_km <= {max_distance_km}
+            WHERE diameter_avg >= ? 
+            AND miss_distance_km <= ?
             ORDER BY miss_distance_km ASC
         '''
-        df = pd.read_sql_query(query, conn)
-        conn.close()
+        df = pd.read_sql_query(query, conn, params=(min_diameter, max_distance_km))
         return df
     
+    def _rows(self, query: str, params=()) -> sqlite3.Cursor:
+        """استعلام مباشر بدون pandas؛ كل صف يُقرأ بالاسم عبر sqlite3.Row"""
+        cursor = self._conn().cursor()
+        cursor.row_factory = sqlite3.Row
+        return cursor.execute(query, params)
+    
     def get_asteroid_by_id(self, asteroid_id: int) -> Optional[dict]:
-        conn = sqlite3.connect(str(self.db_path))
-        cursor = conn.cursor()
-        cursor.execute("SELECT * FROM asteroids WHERE id = ?", (asteroid_id,))
-        row = cursor.fetchone()
-        conn.close()
-        
-        if row:
-            columns = ['id', 'name', 'date', 'diameter_avg', 'velocity_km_s', 
-                      'miss_distance_km', 'energy_megatons_TNT', 'is_potentially_hazardous', 'created_at']
-            return dict(zip(columns, row))
-        return None
+        row = self._rows("SELECT * FROM asteroids WHERE id = ?", (asteroid_id,)).fetchone()
+        return dict(row) if row else None
     
     def get_by_date(self, date: str) -> pd.DataFrame:
-        conn = sqlite3.connect(str(self.db_path))
+        conn = self._conn()
         df = pd.read_sql_query("SELECT * FROM asteroids WHERE date = ?", conn, params=(date,))
-        conn.close()
         return df
+    
+    def get_by_date_fast(self, date: str) -> List[dict]:
+        """نفس get_by_date لكن كقائمة dict لمن لا يحتاج DataFrame"""
+        return [dict(row) for row in self._rows("SELECT * FROM asteroids WHERE date = ?", (date,))]
@@ -0,0 +1,254 @@
+# =============================
+# ASTEROID DEFENSE STRATEGIES
+# =============================
+
+import bisect
+import heapq
+import operator
+from enum import IntEnum
+from functools import lru_cache
+from types import MappingProxyType
+from typing import Dict, List, Tuple
+import numpy as np
+import pandas as pd
+
+# Inclusive upper bounds (AU) of each time-until-impact bucket, and its value in years
+TIME_UNTIL_IMPACT_THRESHOLDS_AU = (0.01, 0.05, 0.1)
+TIME_UNTIL_IMPACT_YEARS = (0.1, 1, 5, 10)   # months, 1 year, 5 years, 10+ years
+TIME_UNTIL_IMPACT_YEARS_ARRAY = np.array(TIME_UNTIL_IMPACT_YEARS)
+
+# Characters dropped from asteroid names when building mission names
+MISSION_NAME_TRANS = str.maketrans('', '', '() ')
+
+PRIORITY_KEY = operator.itemgetter('priority_score')
+
+class ThreatLevel(IntEnum):
+    """Threat levels that raise a strategy's priority; the value is the priority score"""
+    LOW = 1
+    MEDIUM = 2
+    HIGH = 3
+    VERY_HIGH = 4
+    EXTREME = 5
+    
+    @classmethod
+    def from_name(cls, threat_level) -> "ThreatLevel":
+        """Convert a threat level name at the boundary; unknown names count as LOW"""
+        if isinstance(threat_level, cls):
+            return threat_level
+        return cls.__members__.get(threat_level, cls.LOW)
+
+class AsteroidDefenseStrategies:
+    """Defense strategies for different asteroid types and threat levels"""
+    
+    DEFENSE_METHODS = {
+        "KINETIC_IMPACTOR": {
+            "name": "Kinetic Impactor",
+            "description": "Spacecraft impacts asteroid to change its velocity",
+            "effectiveness": "High for small to medium asteroids",
+            "development_level": "Tested (DART Mission)",
+            "time_required": "2-10 years",
+            "cost": "Medium",
+            "best_for": ["S-type", "M-type", "Q-type"]
+        },
+        "GRAVITY_TRACTOR": {
+            "name": "Gravity Tractor", 
+            "description": "Spacecraft flies near asteroid, using gravity to slowly alter course",
+            "effectiveness": "Medium for all sizes",
+            "development_level": "Concept",
+            "time_required": "10-20 years",
+            "cost": "High",
+            "best_for": ["All types"]
+        },
+        "NUCLEAR_DEFLECTION": {
+            "name": "Nuclear Deflection",
+            "description": "Nuclear explosion near asteroid surface alters trajectory",
+            "effectiveness": "Very high for large asteroids",
+            "development_level": "Theoretical",
+            "time_required": "5-15 years", 
+            "cost": "Very high",
+            "best_for": ["C-type", "D-type", "P-type"]
+        },
+        "LASER_ABLATION": {
+            "name": "Laser Ablation",
+            "description": "High-power lasers vaporize surface material, creating thrust",
+            "effectiveness": "Medium for small asteroids",
+            "development_level": "Experimental",
+            "time_required": "15-25 years",
+            "cost": "Very high",
+            "best_for": ["S-type", "M-type"]
+        },
+        "ION_BEAM_SHEPHERD": {
+            "name": "Ion Beam Shepherd",
+            "description": "Ion thrusters directed at asteroid surface for gentle push",
+            "effectiveness": "Low to medium",
+            "development_level": "Concept", 
+            "time_required": "20-30 years",
+            "cost": "Extreme",
+            "best_for": ["Small asteroids"]
+        },
+        "PAINT_OR_COVER": {
+            "name": "Surface Albedo Modification",
+            "description": "Change asteroid's reflectivity to alter solar radiation pressure",
+            "effectiveness": "Very low",
+            "development_level": "Theoretical",
+            "time_required": "10-20 years",
+            "cost": "Low",
+            "best_for": ["Small, rotating asteroids"]
+        }
+    }
+    # Read-only from here on: freeze the table and its best_for lists
+    DEFENSE_METHODS = MappingProxyType({
+        method_key: MappingProxyType({**method, "best_for": tuple(method["best_for"])})
+        for method_key, method in DEFENSE_METHODS.items()
+    })
+    
+    TECHNOLOGY_LEVELS = {
+        "Tested": "READY",
+        "Experimental": "NEAR_TERM",
+        "Concept": "MID_TERM",
+        "Theoretical": "FUTURE"
+    }
+    
+    def __init__(self):
+        self._methods_by_name = {method["name"]: method for method in self.DEFENSE_METHODS.values()}
+        # Everything but the mission name and cooperation flag depends only on
+        # (strategy, threat level, size bucket): at most 6 x 5 x 3 entries
+        self._enhance_static = lru_cache(maxsize=128)(self._build_enhance_static)
+    
+    def get_defense_strategies(self, asteroid_data: Dict, impact_analysis: Dict) -> List[Dict]:
+        """Get appropriate defense strategies based on asteroid properties and threat level"""
+        
+        diameter = asteroid_data['diameter_avg']
+        spectral_type = asteroid_data.get('spectral_type', 'UNKNOWN')
+        threat_level = impact_analysis.get('threat_level', 'LOW')
+        time_until_impact = self.estimate_time_until_impact(asteroid_data)
+        
+        strategies = []
+        
+        # KINETIC_IMPACTOR - Good for most scenarios
+        if diameter < 500 and time_until_impact > 2:
+            strategies.append(self._enhance_strategy(
+                self.DEFENSE_METHODS["KINETIC_IMPACTOR"],
+                asteroid_data,
+                impact_analysis
+            ))
+        
+        # GRAVITY_TRACTOR - For longer timelines
+        if diameter < 1000 and time_until_impact > 10:
+            strategies.append(self._enhance_strategy(
+                self.DEFENSE_METHODS["GRAVITY_TRACTOR"],
+                asteroid_data, 
+                impact_analysis
+            ))
+        
+        # NUCLEAR_DEFLECTION - For high-threat, short timeline scenarios
+        if (threat_level in ["HIGH", "VERY_HIGH", "EXTREME"] and 
+            time_until_impact < 5 and diameter > 200):
+            strategies.append(self._enhance_strategy(
+                self.DEFENSE_METHODS["NUCLEAR_DEFLECTION"],
+                asteroid_data,
+                impact_analysis
+            ))
+        
+        # LASER_ABLATION - For specific asteroid types
+        if spectral_type in ["S-type", "M-type"] and diameter < 200:
+            strategies.append(self._enhance_strategy(
+                self.DEFENSE_METHODS["LASER_ABLATION"],
+                asteroid_data,
+                impact_analysis
+            ))
+        
+        # Top 3 by effectiveness and feasibility (ties keep rule order)
+        return heapq.nlargest(3, strategies, key=PRIORITY_KEY)
+    
+    def get_defense_strategies_batch(self, df: pd.DataFrame, threat_levels) -> List[List[Dict]]:
+        """Same as get_defense_strategies for every row of df, with the selection rules evaluated as column masks"""
+        diameter = df['diameter_avg'].to_numpy()
+        if 'spectral_type' in df:
+            spectral_type = df['spectral_type'].to_numpy()
+        else:
+            spectral_type = np.full(len(df), 'UNKNOWN', dtype=object)
+        threat_levels = np.asarray(threat_levels, dtype=object)
+        time_until_impact = self.estimate_time_until_impact_arr(df['distance_au'].to_numpy())
+        
+        # Same rules and order as get_defense_strategies
+        candidates = (
+            ("KINETIC_IMPACTOR", (diameter < 500) & (time_until_impact > 2)),
+            ("GRAVITY_TRACTOR", (diameter < 1000) & (time_until_impact > 10)),
+            ("NUCLEAR_DEFLECTION", np.isin(threat_levels, ["HIGH", "VERY_HIGH", "EXTREME"]) &
+                                   (time_until_impact < 5) & (diameter > 200)),
+            ("LASER_ABLATION", np.isin(spectral_type, ["S-type", "M-type"]) & (diameter < 200)),
+        )
+        
+        # Python scalars for the per-strategy fields so results stay JSON friendly
+        diameters = diameter.tolist()
+        names = df['name'].tolist()
+        strategies = [[] for _ in range(len(df))]
+        for method_key, mask in candidates:
+            method = self.DEFENSE_METHODS[method_key]
+            for i in np.flatnonzero(mask).tolist():
+                strategies[i].append(self._enhance_strategy(
+                    method,
+                    {'diameter_avg': diameters[i], 'name': names[i]},
+                    {'threat_level': threat_levels[i]}
+                ))
+        
+        return [heapq.nlargest(3, row_strategies, key=PRIORITY_KEY) for row_strategies in strategies]
+    
+    def _enhance_strategy(self, strategy: Dict, asteroid: Dict, impact_analysis: Dict) -> Dict:
+        """Add asteroid-specific details to defense strategy"""
+        
+        diameter = asteroid['diameter_avg']
+        threat_level = ThreatLevel.from_name(impact_analysis.get('threat_level', 'LOW'))
+        size_bucket = 0 if diameter < 100 else 1 if diameter < 500 else 2
+        
+        base, technology_level = self._enhance_static(strategy['name'], threat_level, size_bucket)
+        
+        return {
+            **base,
+            "recommended_mission_name": self._generate_mission_name(asteroid['name']),
+            "required_technology_level": technology_level,
+            "international_cooperation_required": diameter > 200
+        }
+    
+    def _build_enhance_static(self, strategy_name: str, threat_level: ThreatLevel, size_bucket: int) -> Tuple[Dict, str]:
+        """Asteroid-independent part of _enhance_strategy (shared cached dict, do not mutate)"""
+        strategy = self._methods_by_name[strategy_name]
+        
+        # Calculate success probability
+        success_prob = ("80-95%", "60-80%", "30-60%")[size_bucket]
+        
+        # Calculate priority score
+        priority_score = int(threat_level)
+        
+        base = {
+            **strategy,
+            "success_probability": success_prob,
+            "priority_score": priority_score
+        }
+        return base, self._assess_technology_level(strategy['development_level'])
+    
+    def estimate_time_until_impact(self, asteroid: Dict) -> float:
+        """Estimate time until potential impact in years (unknown distance: the last bucket)"""
+        distance_au = asteroid['distance_au']
+        if distance_au is None or distance_au != distance_au:
+            # NULL/NaN never passes a threshold; bisect would put NaN in the first bucket
+            return TIME_UNTIL_IMPACT_YEARS[-1]
+        return TIME_UNTIL_IMPACT_YEARS[bisect.bisect_left(TIME_UNTIL_IMPACT_THRESHOLDS_AU, distance_au)]
+    
+    def estimate_time_until_impact_arr(self, distance_au: np.ndarray) -> np.ndarray:
+        """Vectorized estimate_time_until_impact over miss distances in AU"""
+        # None becomes NaN, which searchsorted places after every threshold (the last bucket)
+        distance_au = np.asarray(distance_au, dtype=float)
+        return TIME_UNTIL_IMPACT_YEARS_ARRAY[np.searchsorted(TIME_UNTIL_IMPACT_THRESHOLDS_AU, distance_au, side='left')]
+    
+    def _generate_mission_name(self, asteroid_name: str) -> str:
+        """Generate a mission name based on asteroid name"""
+        return f"SHIELD_{asteroid_name.translate(MISSION_NAME_TRANS)}"
+    
+    def _assess_technology_level(self, development_level: str) -> str:
+        """Assess technology readiness level"""
+        return self.TECHNOLOGY_LEVELS.get(development_level, "FUTURE")
+
+# Initialize defense strategies
+defense_strategies = AsteroidDefenseStrategies()
@@ -1,13 +1,87 @@
+import httpx
+import math
+import numpy as np
 import requests
 import time
-import random
+from collections import OrderedDict
+from enum import IntEnum
+from functools import lru_cache
 from typing import Dict, Tuple
 
+from app.hashing import splitmix64
+
+NOMINATIM_REVERSE_URL = "https://nominatim.openstreetmap.org/reverse"
+GEOCODE_CACHE_SIZE = 4096
+
+
+class LocType(IntEnum):
+    """نوع منطقة الاصطدام داخلياً؛ يتحول إلى نص فقط في نتيجة analyze_impact"""
+    OCEAN = 0
+    RURAL = 1
+    URBAN_MEDIUM = 2
+    URBAN_HIGH = 3
+    UNKNOWN = 4
+
+
+def _classify_address(address: Dict) -> LocType:
+    """تصنيف المنطقة من حقل address في رد Nominatim"""
+    if 'city' in address or 'town' in address:
+        return LocType.URBAN_HIGH
+    elif 'village' in address or 'suburb' in address:
+        return LocType.URBAN_MEDIUM
+    elif 'country' in address:
+        return LocType.RURAL
+    else:
+        return LocType.UNKNOWN
+
+
+@lru_cache(maxsize=GEOCODE_CACHE_SIZE)
+def _reverse_geocode(lat: float, lng: float, user_agent: str) -> LocType:
+    """استعلام Nominatim مع تخزين النتيجة؛ الأخطاء ترفع استثناء فلا تُخزن"""
+    params = {'lat': lat, 'lon': lng, 'format': 'json'}
+    headers = {'User-Agent': user_agent}
+    
+    response = requests.get(NOMINATIM_REVERSE_URL, params=params, headers=headers, timeout=10)
+    response.raise_for_status()
+    
+    return _classify_address(response.json().get('address', {}))
+
+
 class LocationAnalyzer:
     """محلل المناطق وتقدير الوفيات"""
     
+    # مفهرس بـ LocType: (نسبة الوفيات، الكثافة السكانية، الوصف، التهديد الرئيسي)
+    LOCATION_INFO = (
+        (0.001, 0, "محيط - خطر تسونامي محتمل", "🌊 تسونامي وأمواج صدمية"),
+        (0.01, 30, "منطقة ريفية - كثافة سكانية منخفضة", "💥 انفجار وموجة صدمية"),
+        (0.1, 1000, "منطقة حضرية متوسطة - كثافة سكانية عالية", "💥 دمار مباشر وحرائق"),
+        (0.5, 10000, "منطقة حضرية عالية الكثافة - خطر كبير", "💥 دمار شامل وحرائق واسعة"),
+        (0.05, 100, "منطقة غير معروفة - افتراض خطر متوسط", "⚠️ تأثير مباشر")
+    )
+    
     def __init__(self):
         self.user_agent = 'AsteroidDefenderApp/1.0'
+        self._async_client = None
+        # نفس حد lru_cache في المسار المتزامن حتى لا تنمو الذاكرة مع إحداثيات المستخدمين
+        self._async_cache: "OrderedDict[Tuple[float, float], LocType]" = OrderedDict()
+        # التحليل دالة نقية في (الاسم، الطاقة، الموقع المقرب، نوع الموقع)
+        self._impact_cached = lru_cache(maxsize=8192)(self._build_impact_analysis)
+    
+    def _get_async_client(self) -> httpx.AsyncClient:
+        """عميل HTTP واحد يُعاد استخدامه (keep-alive) لكل الطلبات غير المتزامنة"""
+        if self._async_client is None:
+            self._async_client = httpx.AsyncClient(
+                headers={'User-Agent': self.user_agent},
+                timeout=10.0,
+                limits=httpx.Limits(max_keepalive_connections=8)
+            )
+        return self._async_client
+    
+    async def aclose(self):
+        """إغلاق عميل HTTP عند إيقاف التطبيق"""
+        if self._async_client is not None:
+            await self._async_client.aclose()
+            self._async_client = None
     
     def is_ocean_location(self, lat: float, lng: float) -> bool:
         """كشف المحيطات باستخدام الخرائط الجغرافية"""
@@ -22,62 +96,63 @@ class LocationAnalyzer:
             return True
         return False
     
-    def get_location_type(self, lat: float, lng: float) -> str:
+    def is_ocean_location_bulk(self, lats: np.ndarray, lngs: np.ndarray) -> np.ndarray:
+        """نفس is_ocean_location لمصفوفات من الإحداثيات دفعة واحدة"""
+        lat = np.asarray(lats, dtype=float)
+        lng = np.asarray(lngs, dtype=float)
+        pacific = (-60 <= lat) & (lat <= 60) & (-180 <= lng) & (lng <= -60)
+        atlantic = (-60 <= lat) & (lat <= 60) & (-60 <= lng) & (lng <= 20)
+        indian = (-60 <= lat) & (lat <= 30) & (20 <= lng) & (lng <= 120)
+        return pacific | atlantic | indian
+    
+    def _location_info(self, location_type: LocType) -> Tuple[float, int, str, str]:
+        return self.LOCATION_INFO[location_type]
+    
+    def get_location_type(self, lat: float, lng: float) -> LocType:
         """تحديد نوع المنطقة من الإحداثيات"""
         try:
             if self.is_ocean_location(lat, lng):
-                return "ocean"
+                return LocType.OCEAN
             
-            url = "https://nominatim.openstreetmap.org/reverse"
-            params = {'lat': lat, 'lon': lng, 'format': 'json'}
-            headers = {'User-Agent': self.user_agent}
+            # شبكة 0.1° (~11 كم) حتى تشترك المواقع المتقاربة في نفس الطلب المخزن
+            return _reverse_geocode(round(lat, 1), round(lng, 1), self.user_agent)
+        except Exception:
+            return LocType.UNKNOWN
+    
+    async def get_location_type_async(self, lat: float, lng: float) -> LocType:
+        """نفس get_location_type لكن بدون حجب حلقة الأحداث"""
+        try:
+            if self.is_ocean_location(lat, lng):
+                return LocType.OCEAN
             
-            response = requests.get(url, params=params, headers=headers, timeout=10)
+            key = (round(lat, 1), round(lng, 1))
+            location_type = self._async_cache.get(key)
+            if location_type is not None:
+                self._async_cache.move_to_end(key)
+                return location_type
             
-            if response.status_code == 200:
-                data = response.json()
-                address = data.get('address', {})
-                
-                if 'city' in address or 'town' in address:
-                    return "urban_high"
-                elif 'village' in address or 'suburb' in address:
-                    return "urban_medium"
-                elif 'country' in address:
-                    return "rural"
-                else:
-                    return "unknown"
-            else:
-                return "unknown"
-                
+            params = {'lat': key[0], 'lon': key[1], 'format': 'json'}
+            response = await self._get_async_client().get(NOMINATIM_REVERSE_URL, params=params)
+            response.raise_for_status()
+            location_type = _classify_address(response.json().get('address', {}))
+            
+            self._async_cache[key] = location_type
+            if len(self._async_cache) > GEOCODE_CACHE_SIZE:
+                self._async_cache.popitem(last=False)
+            return location_type
         except Exception:
-            return "unknown"
+            return LocType.UNKNOWN
     
-    def estimate_death_toll(self, asteroid_energy: float, location_type: str, impact_radius_km: float) -> Dict:
+    def estimate_death_toll(self, asteroid_energy: float, location_type: LocType, impact_radius_km: float) -> Dict:
         """تقدير عدد الوفيات المتوقع من اصطدام كويكب بناءً على الطاقة، نوع الموقع، ونصف قطر التأثير."""
+        casualty_factor, population_density, _, _ = self._location_info(location_type)
 
-        casualty_factors = {
-            "ocean": 0.001,
-            "rural": 0.01,
-            "urban_medium": 0.1,
-            "urban_high": 0.5,
-            "unknown": 0.05
-        }
-
-        affected_area = 3.14159 * (impact_radius_km ** 2)
-
-        population_density = {
-            "ocean": 0,
-            "rural": 30,
-            "urban_medium": 1000,
-            "urban_high": 10000,
-            "unknown": 100
-        }
+        affected_area = math.pi * impact_radius_km * impact_radius_km
 
-        base_population = affected_area * population_density.get(location_type, 100)
-        casualty_factor = casualty_factors.get(location_type, 0.05)
+        base_population = affected_area * population_density
         estimated_deaths = int(base_population * casualty_factor)
 
-        if location_type == "ocean" and asteroid_energy > 10:
+        if location_type == LocType.OCEAN and asteroid_energy > 10:
             estimated_deaths += int(asteroid_energy * 10000)
 
         return {
@@ -89,9 +164,9 @@ class LocationAnalyzer:
 
     def generate_impact_site(self, asteroid_id: int) -> Tuple[float, float]:
         """توليد إحداثيات موقع الاصطدام اعتماداً على رقم الكويكب (Deterministic)."""
-        random.seed(asteroid_id)
-        lat = random.uniform(-60, 60)
-        lng = random.uniform(-180, 180)
+        h = splitmix64(asteroid_id)
+        lat = (h & 0xFFFFFFFF) / 2**32 * 120 - 60
+        lng = (h >> 32) / 2**32 * 360 - 180
         return lat, lng
 
     def calculate_impact_radius(self, energy_megatons: float) -> float:
@@ -99,48 +174,55 @@ class LocationAnalyzer:
         # معادلة تقريبية: كل 1 ميغاطن TNT ≈ 1 كم نصف قطر
         return max(1, energy_megatons ** 0.5 * 2)
 
-    def get_location_description(self, location_type: str) -> str:
+    def get_location_description(self, location_type: LocType) -> str:
         """وصف الموقع"""
-        descriptions = {
-            "ocean": "محيط - خطر تسونامي محتمل",
-            "rural": "منطقة ريفية - كثافة سكانية منخفضة", 
-            "urban_medium": "منطقة حضرية متوسطة - كثافة سكانية عالية",
-            "urban_high": "منطقة حضرية عالية الكثافة - خطر كبير",
-            "unknown": "منطقة غير معروفة - افتراض خطر متوسط"
-        }
-        return descriptions.get(location_type, "منطقة غير معروفة")
+        return self._location_info(location_type)[2]
 
-    def get_primary_threat(self, location_type: str) -> str:
+    def get_primary_threat(self, location_type: LocType) -> str:
         """تحديد التهديد الرئيسي"""
-        threats = {
-            "ocean": "🌊 تسونامي وأمواج صدمية",
-            "rural": "💥 انفجار وموجة صدمية",
-            "urban_medium": "💥 دمار مباشر وحرائق", 
-            "urban_high": "💥 دمار شامل وحرائق واسعة",
-            "unknown": "⚠️ تأثير مباشر"
-        }
-        return threats.get(location_type, "⚠️ تأثير غير محدد")
+        return self._location_info(location_type)[3]
 
     def analyze_impact(self, asteroid_data: Dict, impact_lat: float, impact_lng: float) -> Dict:
         """تحليل تأثير كويكب على موقع محدد"""
         location_type = self.get_location_type(impact_lat, impact_lng)
-        impact_radius = self.calculate_impact_radius(asteroid_data["energy_megatons_TNT"])
+        return self._impact_result(asteroid_data, impact_lat, impact_lng, location_type)
+    
+    async def analyze_impact_async(self, asteroid_data: Dict, impact_lat: float, impact_lng: float) -> Dict:
+        """نفس analyze_impact مع تحديد نوع الموقع بشكل غير متزامن"""
+        location_type = await self.get_location_type_async(impact_lat, impact_lng)
+        return self._impact_result(asteroid_data, impact_lat, impact_lng, location_type)
+    
+    def _impact_result(self, asteroid_data: Dict, impact_lat: float, impact_lng: float,
+                       location_type: LocType) -> Dict:
+        """نسخة من التحليل المخزن (المفتاح مقرب إلى 0.01°) مع الإحداثيات الفعلية للموقع"""
+        cached = self._impact_cached(asteroid_data["name"], asteroid_data["energy_megatons_TNT"],
+                                     round(impact_lat, 2), round(impact_lng, 2), location_type)
+        return {
+            "asteroid_name": cached["asteroid_name"],
+            "impact_location": {**cached["impact_location"], "coordinates": [impact_lat, impact_lng]},
+            "impact_analysis": dict(cached["impact_analysis"])
+        }
+    
+    def _build_impact_analysis(self, name: str, energy_megatons: float, lat_bucket: float,
+                               lng_bucket: float, location_type: LocType) -> Dict:
+        """يعتمد فقط على مفتاح التخزين؛ الإحداثيات يضعها _impact_result"""
+        impact_radius = self.calculate_impact_radius(energy_megatons)
         
         results = self.estimate_death_toll(
-            asteroid_energy=asteroid_data["energy_megatons_TNT"],
+            asteroid_energy=energy_megatons,
             location_type=location_type,
             impact_radius_km=impact_radius
         )
         
         return {
-            "asteroid_name": asteroid_data["name"],
+            "asteroid_name": name,
             "impact_location": {
-                "coordinates": [impact_lat, impact_lng],
-                "type": location_type,
+                "coordinates": None,
+                "type": location_type.name.lower(),
                 "description": self.get_location_description(location_type)
             },
             "impact_analysis": {
-                "energy_megatons": asteroid_data["energy_megatons_TNT"],
+                "energy_megatons": energy_megatons,
                 "impact_radius_km": impact_radius,
                 "estimated_deaths": results["estimated_deaths"],
                 "affected_area_km2": results["affected_area_km2"],
@@ -1,8 +1,12 @@
 from fastapi import FastAPI, HTTPException, Query
 from fastapi.middleware.cors import CORSMiddleware
+from fastapi.responses import ORJSONResponse, Response
+from collections import OrderedDict
 from contextlib import asynccontextmanager
+from functools import lru_cache
 from typing import Optional, Dict, List, Tuple
 from app.database import AsteroidDB
+from app.constants import INV_AU_KM
 from app.physics import AsteroidPhysics
 from app.nasa_client import NASAAPIClient
 from app.models import AsteroidSummary, EnergyCalculation
@@ -10,379 +14,26 @@ from app.config import Config
 from app.location_analyzer import location_analyzer
 from app.quantum_analyzer import quantum_analyzer
 from app.usgs_analyzer import USGSAnalyzer
+from app.AsteroidTypeClassifier import asteroid_classifier
+from app.defense_strategies import defense_strategies
+from app.threat import classify_threat, classify_threat_scalar
+import asyncio
+import bisect
+import copy
 import logging
+import math
+import operator
+import orjson
+import time
+import numpy as np
 import pandas as pd
-import random
-from typing import Dict
-import hashlib
-from math import radians, sin, cos, sqrt, atan2
+from math import radians, cos
 
-# =============================
-# ASTEROID TYPE CLASSIFIER
-# =============================
-
-import random
-from typing import Dict
-
-class AsteroidTypeClassifier:
-    """Classify asteroids by spectral type with corresponding images"""
-    
-    ASTEROID_TYPES = {
-        "C": {
-            "name": "C-type (Carbonaceous)",
-            "description": "Dark, carbon-rich asteroids. Most common in outer belt.",
-            "albedo_range": (0.03, 0.10),
-            "image_url": "/static/images/asteroids/c-type.jpg",
-            "characteristics": ["Very dark", "Carbon-rich", "Primitive composition"],
-            "composition": "Carbon, water ice, organic compounds"
-        },
-        "S": {
-            "name": "S-type (Silicaceous)",
-            "description": "Stony, silicate-rich asteroids. Common in inner belt.",
-            "albedo_range": (0.10, 0.22),
-            "image_url": "/static/images/asteroids/s-type.jpg",
-            "characteristics": ["Moderate brightness", "Silicate minerals", "Rocky"],
-            "composition": "Iron, magnesium silicates"
-        },
-        "M": {
-            "name": "M-type (Metallic)",
-            "description": "Metal-rich asteroids, possibly exposed cores.",
-            "albedo_range": (0.10, 0.18),
-            "image_url": "/static/images/asteroids/m-type.jpg",
-            "characteristics": ["Metal-rich", "High density", "Nickel-iron"],
-            "composition": "Iron, nickel, cobalt"
-        },
-        "V": {
-            "name": "V-type (Vesta-like)",
-            "description": "Basaltic composition, similar to asteroid Vesta.",
-            "albedo_range": (0.30, 0.50),
-            "image_url": "/static/images/asteroids/v-type.jpg",
-            "characteristics": ["Very bright", "Basaltic", "Differentiated"],
-            "composition": "Basalt, pyroxene"
-        },
-        "B": {
-            "name": "B-type",
-            "description": "Similar to C-type but slightly brighter.",
-            "albedo_range": (0.04, 0.08),
-            "image_url": "/static/images/asteroids/b-type.jpg",
-            "characteristics": ["Dark", "Primitive", "Carbon-bearing"],
-            "composition": "Carbonaceous materials"
-        },
-        "Q": {
-            "name": "Q-type",
-            "description": "Similar to ordinary chondrite meteorites.",
-            "albedo_range": (0.15, 0.30),
-            "image_url": "/static/images/asteroids/q-type.jpg",
-            "characteristics": ["Fresh surface", "Unweathered", "Stony"],
-            "composition": "Olivine, pyroxene, metal"
-        },
-        "K": {
-            "name": "K-type",
-            "description": "Intermediate between C and S types.",
-            "albedo_range": (0.08, 0.15),
-            "image_url": "/static/images/asteroids/k-type.jpg",
-            "characteristics": ["Moderate reflectance", "Mixed composition"],
-            "composition": "Mixed silicates and carbonaceous materials"
-        },
-        "D": {
-            "name": "D-type",
-            "description": "Very dark, organic-rich asteroids.",
-            "albedo_range": (0.02, 0.05),
-            "image_url": "/static/images/asteroids/d-type.jpg",
-            "characteristics": ["Extremely dark", "Organic-rich"],
-            "composition": "Organic compounds, water ice"
-        },
-        "P": {
-            "name": "P-type",
-            "description": "Similar to D-type, very dark and red.",
-            "albedo_range": (0.02, 0.06),
-            "image_url": "/static/images/asteroids/p-type.jpg",
-            "characteristics": ["Very dark", "Reddish", "Primitive"],
-            "composition": "Organic materials, silicates"
-        },
-        "R": {
-            "name": "R-type",
-            "description": "Rich in olivine, relatively rare.",
-            "albedo_range": (0.20, 0.40),
-            "image_url": "/static/images/asteroids/r-type.jpg",
-            "characteristics": ["Olivine-rich", "Bright", "Uncommon"],
-            "composition": "Olivine, pyroxene"
-        },
-        "T": {
-            "name": "T-type",
-            "description": "Moderately red, similar to D and P types.",
-            "albedo_range": (0.03, 0.07),
-            "image_url": "/static/images/asteroids/t-type.jpg",
-            "characteristics": ["Dark", "Reddish", "Trojan asteroids"],
-            "composition": "Organic materials"
-        },
-        "A": {
-            "name": "A-type",
-            "description": "Olivine-dominated, very rare.",
-            "albedo_range": (0.15, 0.30),
-            "image_url": "/static/images/asteroids/a-type.jpg",
-            "characteristics": ["Olivine-rich", "Differentiated", "Extremely rare"],
-            "composition": "Pure olivine"
-        },
-        "L": {
-            "name": "L-type",
-            "description": "Similar to K-type, moderate albedo.",
-            "albedo_range": (0.08, 0.18),
-            "image_url": "/static/images/asteroids/l-type.jpg",
-            "characteristics": ["Moderate brightness", "Mixed composition"],
-            "composition": "Mixed materials"
-        },
-        "F": {
-            "name": "F-type",
-            "description": "Similar to B-type, carbon-rich.",
-            "albedo_range": (0.03, 0.06),
-            "image_url": "/static/images/asteroids/f-type.jpg",
-            "characteristics": ["Dark", "Carbonaceous"],
-            "composition": "Carbon compounds"
-        },
-        "G": {
-            "name": "G-type",
-            "description": "Similar to C-type with UV absorption.",
-            "albedo_range": (0.05, 0.09),
-            "image_url": "/static/images/asteroids/g-type.jpg",
-            "characteristics": ["Dark", "Carbonaceous", "UV absorption"],
-            "composition": "Carbonaceous materials with organics"
-        },
-        "U": {
-            "name": "U-type (Unclassified)",
-            "description": "Does not fit standard classifications.",
-            "albedo_range": (0.0, 1.0),
-            "image_url": "/static/images/asteroids/u-type.jpg",
-            "characteristics": ["Unusual spectrum", "Rare"],
-            "composition": "Variable"
-        },
-        "UNKNOWN": {
-            "name": "Unknown/Unclassified",
-            "description": "Spectral type not determined.",
-            "albedo_range": (0.0, 1.0),
-            "image_url": "/static/images/asteroids/unknown.jpg",
-            "characteristics": ["Classification pending", "Insufficient data"],
-            "composition": "Unknown"
-        }
-    }
-    
-    def classify_by_id(self, asteroid_id: int) -> str:
-        """Classify asteroid using deterministic pseudo-random selection"""
-        random.seed(asteroid_id)
-        
-        type_distribution = [
-            ("S", 45), ("C", 30), ("M", 5), ("Q", 5),
-            ("V", 3), ("B", 2), ("K", 2), ("D", 2),
-            ("P", 2), ("R", 1), ("T", 1), ("A", 1), ("L", 1)
-        ]
-        
-        total = sum(weight for _, weight in type_distribution)
-        rand_val = random.randint(1, total)
-        
-        cumulative = 0
-        for type_code, weight in type_distribution:
-            cumulative += weight
-            if rand_val <= cumulative:
-                random.seed()
-                return type_code
-        
-        random.seed()
-        return "UNKNOWN"
-    
-    def get_type_info(self, type_code: str) -> Dict:
-        """Get complete information for an asteroid type"""
-        return self.ASTEROID_TYPES.get(type_code, self.ASTEROID_TYPES["UNKNOWN"])
-    
-    def classify_asteroid(self, asteroid_id: int) -> Dict:
-        """Classify asteroid and return full information"""
-        type_code = self.classify_by_id(asteroid_id)
-        type_info = self.get_type_info(type_code)
-        
-        return {
-            "type_code": type_code,
-            "type_name": type_info["name"],
-            "description": type_info["description"],
-            "image_url": type_info["image_url"],
-            "characteristics": type_info["characteristics"],
-            "composition": type_info["composition"],
-            "classification_method": "statistical",
-            "confidence": "low"
-        }
-class AsteroidDefenseStrategies:
-    """Defense strategies for different asteroid types and threat levels"""
-    
-    DEFENSE_METHODS = {
-        "KINETIC_IMPACTOR": {
-            "name": "Kinetic Impactor",
-            "description": "Spacecraft impacts asteroid to change its velocity",
-            "effectiveness": "High for small to medium asteroids",
-            "development_level": "Tested (DART Mission)",
-            "time_required": "2-10 years",
-            "cost": "Medium",
-            "best_for": ["S-type", "M-type", "Q-type"]
-        },
-        "GRAVITY_TRACTOR": {
-            "name": "Gravity Tractor", 
-            "description": "Spacecraft flies near asteroid, using gravity to slowly alter course",
-            "effectiveness": "Medium for all sizes",
-            "development_level": "Concept",
-            "time_required": "10-20 years",
-            "cost": "High",
-            "best_for": ["All types"]
-        },
-        "NUCLEAR_DEFLECTION": {
-            "name": "Nuclear Deflection",
-            "description": "Nuclear explosion near asteroid surface alters trajectory",
-            "effectiveness": "Very high for large asteroids",
-            "development_level": "Theoretical",
-            "time_required": "5-15 years", 
-            "cost": "Very high",
-            "best_for": ["C-type", "D-type", "P-type"]
-        },
-        "LASER_ABLATION": {
-            "name": "Laser Ablation",
-            "description": "High-power lasers vaporize surface material, creating thrust",
-            "effectiveness": "Medium for small asteroids",
-            "development_level": "Experimental",
-            "time_required": "15-25 years",
-            "cost": "Very high",
-            "best_for": ["S-type", "M-type"]
-        },
-        "ION_BEAM_SHEPHERD": {
-            "name": "Ion Beam Shepherd",
-            "description": "Ion thrusters directed at asteroid surface for gentle push",
-            "effectiveness": "Low to medium",
-            "development_level": "Concept", 
-            "time_required": "20-30 years",
-            "cost": "Extreme",
-            "best_for": ["Small asteroids"]
-        },
-        "PAINT_OR_COVER": {
-            "name": "Surface Albedo Modification",
-            "description": "Change asteroid's reflectivity to alter solar radiation pressure",
-            "effectiveness": "Very low",
-            "development_level": "Theoretical",
-            "time_required": "10-20 years",
-            "cost": "Low",
-            "best_for": ["Small, rotating asteroids"]
-        }
-    }
-    
-    def get_defense_strategies(self, asteroid_data: Dict, impact_analysis: Dict) -> List[Dict]:
-        """Get appropriate defense strategies based on asteroid properties and threat level"""
-        
-        diameter = asteroid_data['diameter_avg']
-        spectral_type = asteroid_data.get('spectral_type', 'UNKNOWN')
-        threat_level = impact_analysis.get('threat_level', 'LOW')
-        time_until_impact = self.estimate_time_until_impact(asteroid_data)
-        
-        strategies = []
-        
-        # KINETIC_IMPACTOR - Good for most scenarios
-        if diameter < 500 and time_until_impact > 2:
-            strategies.append(self._enhance_strategy(
-                self.DEFENSE_METHODS["KINETIC_IMPACTOR"],
-                asteroid_data,
-                impact_analysis
-            ))
-        
-        # GRAVITY_TRACTOR - For longer timelines
-        if diameter < 1000 and time_until_impact > 10:
-            strategies.append(self._enhance_strategy(
-                self.DEFENSE_METHODS["GRAVITY_TRACTOR"],
-                asteroid_data, 
-                impact_analysis
-            ))
-        
-        # NUCLEAR_DEFLECTION - For high-threat, short timeline scenarios
-        if (threat_level in ["HIGH", "VERY_HIGH", "EXTREME"] and 
-            time_until_impact < 5 and diameter > 200):
-            strategies.append(self._enhance_strategy(
-                self.DEFENSE_METHODS["NUCLEAR_DEFLECTION"],
-                asteroid_data,
-                impact_analysis
-            ))
-        
-        # LASER_ABLATION - For specific asteroid types
-        if spectral_type in ["S-type", "M-type"] and diameter < 200:
-            strategies.append(self._enhance_strategy(
-                self.DEFENSE_METHODS["LASER_ABLATION"],
-                asteroid_data,
-                impact_analysis
-            ))
-        
-        # Sort by effectiveness and feasibility
-        strategies.sort(key=lambda x: x['priority_score'], reverse=True)
-        
-        return strategies[:3]  # Return top 3 strategies
-    
-    def _enhance_strategy(self, strategy: Dict, asteroid: Dict, impact_analysis: Dict) -> Dict:
-        """Add asteroid-specific details to defense strategy"""
-        
-        diameter = asteroid['diameter_avg']
-        threat_level = impact_analysis.get('threat_level', 'LOW')
-        
-        # Calculate success probability
-        if diameter < 100:
-            success_prob = "80-95%"
-        elif diameter < 500:
-            success_prob = "60-80%" 
-        else:
-            success_prob = "30-60%"
-        
-        # Calculate priority score
-        priority_factors = {
-            "LOW": 1, "MEDIUM": 2, "HIGH": 3, "VERY_HIGH": 4, "EXTREME": 5
-        }
-        priority_score = priority_factors.get(threat_level, 1)
-        
-        return {
-            **strategy,
-            "success_probability": success_prob,
-            "priority_score": priority_score,
-            "recommended_mission_name": self._generate_mission_name(asteroid['name']),
-            "required_technology_level": self._assess_technology_level(strategy['development_level']),
-            "international_cooperation_required": diameter > 200
-        }
-    
-    def estimate_time_until_impact(self, asteroid: Dict) -> float:
-        """Estimate time until potential impact in years"""
-        distance_au = asteroid['miss_distance_km'] / 149597870.7
-        
-        if distance_au <= 0.01:
-            return 0.1  # Months
-        elif distance_au <= 0.05:
-            return 1    # 1 year
-        elif distance_au <= 0.1:
-            return 5    # 5 years
-        else:
-            return 10   # 10+ years
-    
-    def _generate_mission_name(self, asteroid_name: str) -> str:
-        """Generate a mission name based on asteroid name"""
-        base_name = asteroid_name.replace('(', '').replace(')', '').replace(' ', '')
-        return f"SHIELD_{base_name}"
-    
-    def _assess_technology_level(self, development_level: str) -> str:
-        """Assess technology readiness level"""
-        levels = {
-            "Tested": "READY",
-            "Experimental": "NEAR_TERM", 
-            "Concept": "MID_TERM",
-            "Theoretical": "FUTURE"
-        }
-        return levels.get(development_level, "FUTURE")
-
-# Initialize defense strategies
-defense_strategies = AsteroidDefenseStrategies()
-# Initialize classifier
-asteroid_classifier = AsteroidTypeClassifier()
 # Initialize components
 db = AsteroidDB()
 physics = AsteroidPhysics()
 nasa_client = NASAAPIClient()
 usgs_analyzer = USGSAnalyzer()
-asteroid_classifier = AsteroidTypeClassifier()
 
 # Setup logging
 logging.basicConfig(level=logging.INFO)
@@ -415,11 +66,13 @@ async def lifespan(app: FastAPI):
     yield
     
     print("🛑 Shutting down...")
+    await location_analyzer.aclose()
 
 app = FastAPI(
     title="NASA NEO Threat Assessment API",
     description="Real asteroid threat detection and analysis",
     version="4.0.0",
+    default_response_class=ORJSONResponse,
     lifespan=lifespan
 )
 
@@ -431,93 +84,91 @@ app.add_middleware(
     allow_headers=["*"],
 )
 
+# (db.change_token(), scanned_at, threats) of the last scan. The token catches
+# writes from other workers too; the TTL covers a same-second REPLACE it can miss
+THREATS_CACHE_TTL_SECONDS = 60
+_threats_cache: Tuple[Optional[tuple], float, list] = (None, 0.0, [])
+
 def validate_and_identify_threats():
-    """Identify real asteroid threats from data"""
+    """Identify real asteroid threats from data (cached per table contents; shared list, do not mutate)"""
+    global _threats_cache
+    token = db.change_token()
+    cached_token, scanned_at, threats = _threats_cache
+    now = time.monotonic()
+    if cached_token != token or now - scanned_at > THREATS_CACHE_TTL_SECONDS:
+        threats = _identify_threats()
+        _threats_cache = (token, now, threats)
+    return threats
+
+def _identify_threats():
     df = db.get_all_asteroids()
     
     if df.empty:
         return []
     
-    threats = []
+    distance_au = df['distance_au'].to_numpy()
     
-    for idx, asteroid in df.iterrows():
-        distance_au = asteroid['miss_distance_km'] / 149597870.7
-        
-        # CRITICAL: Objects within 0.05 AU are potentially hazardous
-        if distance_au <= 0.05:
-            threat_level = "CRITICAL" if distance_au <= 0.01 else "HIGH"
-            
-            threats.append({
-                'id': asteroid['id'],
-                'name': asteroid['name'],
-                'date': asteroid['date'],
-                'diameter_km': asteroid['diameter_avg'],
-                'velocity_km_s': asteroid['velocity_km_s'],
-                'distance_km': asteroid['miss_distance_km'],
-                'distance_au': round(distance_au, 6),
-                'energy_mt': asteroid['energy_megatons_TNT'],
-                'threat_level': threat_level,
-                'is_immediate_threat': distance_au <= 0.01
-            })
+    # CRITICAL: Objects within 0.05 AU are potentially hazardous
+    mask = distance_au <= 0.05
+    distance_au = distance_au[mask]
+    
+    threats = df.loc[mask, ['id', 'name', 'date', 'diameter_avg', 'velocity_km_s',
+                            'miss_distance_km', 'energy_megatons_TNT']].rename(columns={
+        'diameter_avg': 'diameter_km',
+        'miss_distance_km': 'distance_km',
+        'energy_megatons_TNT': 'energy_mt'
+    })
+    threats.insert(6, 'distance_au', np.round(distance_au, 6))
+    threats['threat_level'] = classify_threat(distance_au)
+    threats['is_immediate_threat'] = distance_au <= 0.01
     
     # Sort by threat level (closest first)
-    threats.sort(key=lambda x: x['distance_au'])
-    return threats
+    return threats.sort_values('distance_au', kind='stable').to_dict('records')
 
 # =============================
 # HELPER FUNCTIONS
 # =============================
 
-def calculate_distance(lat1: float, lng1: float, lat2: float, lng2: float) -> float:
-    """Calculate distance between two points in km"""
+ENERGY_KEY = operator.itemgetter('energy_megatons_TNT')
+COUNT_KEY = operator.itemgetter(1)
+
+def _haversine_many(lat1, lng1, lats_rad, lngs_rad, cos_lats):
+    """Haversine distance in km from one point to many points whose radians and cos(lat) are precomputed"""
     R = 6371
     lat1_rad = radians(lat1)
-    lat2_rad = radians(lat2)
-    delta_lat = radians(lat2 - lat1)
-    delta_lng = radians(lng2 - lng1)
+    lng1_rad = radians(lng1)
     
-    a = sin(delta_lat/2)**2 + cos(lat1_rad) * cos(lat2_rad) * sin(delta_lng/2)**2
-    c = 2 * atan2(sqrt(a), sqrt(1-a))
+    a = np.sin((lats_rad - lat1_rad)/2)**2 + cos(lat1_rad) * cos_lats * np.sin((lngs_rad - lng1_rad)/2)**2
+    c = 2 * np.arctan2(np.sqrt(a), np.sqrt(1-a))
     return R * c
 
+IMPACT_SITES = (
+    (40.7128, -74.0060),   # New York
+    (35.6762, 139.6503),   # Tokyo
+    (25.0, 55.0),          # Dubai
+    (-33.8688, 151.2093),  # Sydney
+    (0, 0),                # Atlantic Ocean
+    (-45.0, -170.0),       # Pacific Ocean
+    (48.8566, 2.3522),     # Paris
+)
+
 def generate_impact_site(asteroid_id: int) -> Tuple[float, float]:
     """Generate realistic impact site based on asteroid ID"""
-    impact_sites = [
-        (40.7128, -74.0060),   # New York
-        (35.6762, 139.6503),   # Tokyo
-        (25.0, 55.0),          # Dubai
-        (-33.8688, 151.2093),  # Sydney
-        (0, 0),                # Atlantic Ocean
-        (-45.0, -170.0),       # Pacific Ocean
-        (48.8566, 2.3522),     # Paris
-    ]
-    return impact_sites[asteroid_id % len(impact_sites)]
+    return IMPACT_SITES[asteroid_id % len(IMPACT_SITES)]
+
+# Upper bounds (exclusive) of each energy bucket and the value for each bucket
+IMPACT_RADIUS_THRESHOLDS = (1, 10, 100)
+IMPACT_RADIUS_VALUES = (5, 15, 30, 50)
+IMPACT_ENERGY_THRESHOLDS = (0.01, 1, 10, 100, 1000)
+IMPACT_ENERGY_CLASSES = ("Very Small", "Small", "Medium", "Large", "Very Large", "Extinction Level")
 
 def calculate_impact_radius(energy_mt: float) -> float:
     """Calculate impact radius based on energy"""
-    if energy_mt < 1:
-        return 5
-    elif energy_mt < 10:
-        return 15
-    elif energy_mt < 100:
-        return 30
-    else:
-        return 50
+    return IMPACT_RADIUS_VALUES[bisect.bisect_right(IMPACT_RADIUS_THRESHOLDS, energy_mt)]
 
 def classify_impact_energy(energy_mt: float) -> str:
     """Classify impact energy"""
-    if energy_mt < 0.01:
-        return "Very Small"
-    elif energy_mt < 1:
-        return "Small"
-    elif energy_mt < 10:
-        return "Medium"
-    elif energy_mt < 100:
-        return "Large"
-    elif energy_mt < 1000:
-        return "Very Large"
-    else:
-        return "Extinction Level"
+    return IMPACT_ENERGY_CLASSES[bisect.bisect_right(IMPACT_ENERGY_THRESHOLDS, energy_mt)]
 
 def calculate_risk_score(asteroid, distance_au: float) -> float:
     """Calculate comprehensive risk score (0-1)"""
@@ -559,29 +210,47 @@ def generate_emergency_recommendations(asteroid, distance_au):
 # NATURAL HAZARDS FUNCTIONS
 # =============================
 
+# (name, lat, lng, details)
+VOLCANO_CATALOG = (
+    ("Mount St. Helens", 46.2, -122.2, {
+        "elevation_m": 2549,
+        "last_eruption": "2008",
+        "status": "Active",
+        "volcano_type": "Stratovolcano",
+        "risk_level": "High"
+    }),
+)
+VOLCANO_LATS = np.array([volcano[1] for volcano in VOLCANO_CATALOG], dtype=float)
+VOLCANO_LNGS = np.array([volcano[2] for volcano in VOLCANO_CATALOG], dtype=float)
+# Per-volcano trig terms, so a query only evaluates trig for its own coordinates
+VOLCANO_LATS_RAD = np.radians(VOLCANO_LATS)
+VOLCANO_LNGS_RAD = np.radians(VOLCANO_LNGS)
+VOLCANO_COS_LATS = np.cos(VOLCANO_LATS_RAD)
+VOLCANO_ACTIVE = np.array([volcano[3]['status'] == 'Active' for volcano in VOLCANO_CATALOG], dtype=bool)
+
+@lru_cache(maxsize=4096)
+def _volcano_distances(lat: float, lng: float) -> np.ndarray:
+    """Rounded distance to every catalog volcano; shared by all radius queries at one site"""
+    distances = np.round(_haversine_many(lat, lng, VOLCANO_LATS_RAD, VOLCANO_LNGS_RAD, VOLCANO_COS_LATS), 1)
+    distances.setflags(write=False)
+    return distances
+
 def get_nearby_volcanoes(lat: float, lng: float, radius_km: float = 500):
     """Get nearby volcanoes"""
     try:
-        mock_volcanoes = [
-            {
-                "name": "Mount St. Helens",
-                "distance_km": round(calculate_distance(lat, lng, 46.2, -122.2), 1),
-                "elevation_m": 2549,
-                "last_eruption": "2008",
-                "status": "Active",
-                "volcano_type": "Stratovolcano",
-                "risk_level": "High"
-            }
+        distances = _volcano_distances(lat, lng)
+        in_range = np.flatnonzero(distances <= radius_km)
+        volcanoes_in_range = [
+            {"name": VOLCANO_CATALOG[i][0], "distance_km": distance_km, **VOLCANO_CATALOG[i][3]}
+            for i, distance_km in zip(in_range.tolist(), distances[in_range].tolist())
         ]
         
-        volcanoes_in_range = [v for v in mock_volcanoes if v['distance_km'] <= radius_km]
-        
         return {
             "count": len(volcanoes_in_range),
             "search_radius_km": radius_km,
-            "active_volcanoes_count": len([v for v in volcanoes_in_range if v['status'] == 'Active']),
+            "active_volcanoes_count": int(np.count_nonzero(VOLCANO_ACTIVE[in_range])),
             "volcanoes": volcanoes_in_range,
-            "closest_volcano": min(volcanoes_in_range, key=lambda x: x['distance_km']) if volcanoes_in_range else None
+            "closest_volcano": volcanoes_in_range[int(np.argmin(distances[in_range]))] if in_range.size else None
         }
         
     except Exception as e:
@@ -591,27 +260,101 @@ def get_nearby_volcanoes(lat: float, lng: float, radius_km: float = 500):
             "volcanoes": []
         }
 
-def assess_volcanic_trigger_risk(lat: float, lng: float, asteroid: Dict):
-    """Assess volcanic eruption trigger risk"""
-    energy = asteroid['energy_megatons_TNT']
-    volcanoes_data = get_nearby_volcanoes(lat, lng, radius_km=300)
-    active_volcanoes_count = volcanoes_data.get('active_volcanoes_count', 0)
-    
-    if energy > 1000 and active_volcanoes_count > 0:
-        risk_level = "VERY_HIGH"
-        probability = "40-60%"
-    elif energy > 500 and active_volcanoes_count > 0:
-        risk_level = "HIGH"
-        probability = "25-40%"
-    elif energy > 100 and active_volcanoes_count > 0:
-        risk_level = "MEDIUM"
-        probability = "15-25%"
-    elif energy > 50 and active_volcanoes_count > 0:
-        risk_level = "LOW_MEDIUM"
-        probability = "5-15%"
-    else:
-        risk_level = "LOW"
-        probability = "<5%"
+# Lower bounds (exclusive) of each hazard energy bucket and the values for each bucket
+VOLCANIC_ENERGY_THRESHOLDS = (50, 100, 500, 1000)
+VOLCANIC_RISK_LEVELS = (
+    ("LOW", "<5%"),
+    ("LOW_MEDIUM", "5-15%"),
+    ("MEDIUM", "15-25%"),
+    ("HIGH", "25-40%"),
+    ("VERY_HIGH", "40-60%"),
+)
+ASH_FALL_ENERGY_THRESHOLDS = (100, 500)
+ASH_FALL_RISK_LEVELS = ("LOW", "MEDIUM", "HIGH")
+TSUNAMI_ENERGY_THRESHOLDS = (1, 10, 100)
+# (risk level, evacuate when closer to the coast than this many km, warning)
+TSUNAMI_RISK_LEVELS = (
+    ("LOW", 0, "Small waves expected - minimal coastal impact"),
+    ("MEDIUM", 500, "Moderate tsunami - monitor coastal warnings"),
+    ("HIGH", float('inf'), "Major tsunami possible - coastal areas at risk"),
+    ("EXTREME", float('inf'), "Catastrophic tsunami - {distance_to_coast}km to nearest coast"),
+)
+# Land impacts do not depend on energy, so their results are fixed
+TSUNAMI_LAND_RISK = {
+    "tsunami_expected": False,
+    "risk_level": "NONE",
+    "reason": "Land impact - no tsunami generation",
+    "coastal_warnings_needed": False,
+    "evacuation_recommended": False
+}
+TSUNAMI_WAVE_ENERGY_THRESHOLDS = (1, 10, 100, 1000)
+TSUNAMI_WAVE_HEIGHTS = (
+    ("0.5-1", "Very small waves"),
+    ("1-3", "Small tsunami"),
+    ("3-10", "Moderate tsunami"),
+    ("10-50", "Major tsunami"),
+    ("50-100+", "Mega-tsunami"),
+)
+TSUNAMI_LAND_WAVE_HEIGHT = {
+    "wave_height_m": 0,
+    "classification": "No tsunami",
+    "reason": "Land impact - no significant water displacement"
+}
+SEISMIC_ENERGY_THRESHOLDS = (10, 100, 1000)
+SEISMIC_MAGNITUDES = ("4.0-5.0", "5.0-6.0", "6.0-7.0", "7.0-8.0")
+SEISMIC_INTENSITIES = ("V-VI", "VI-VII", "VII-IX", "IX-X")
+DEBRIS_CLOUD_ENERGY_THRESHOLDS = (100, 1000)
+DEBRIS_CLIMATE_IMPACTS = ("Localized effects only", "Regional climate effects", "Global cooling for years")
+
+# Helper results that depend only on the energy bucket (or on nothing at all)
+# are built once and returned as-is; they go straight into the JSON response.
+INDUCED_QUAKE_RESULTS = tuple(
+    {"max_magnitude": magnitude, "duration_hours": "2-6", "aftershocks_expected": True}
+    for magnitude in SEISMIC_MAGNITUDES
+)
+DEBRIS_CLOUD_RESULTS = tuple(
+    {"altitude_km": "20-50", "climate_impact": climate_impact, "duration": "Months to years"}
+    for climate_impact in DEBRIS_CLIMATE_IMPACTS
+)
+INFRASTRUCTURE_IMPACT = {
+    "critical_infrastructure_at_risk": [
+        "Power grids",
+        "Water treatment plants",
+        "Transportation networks",
+        "Communication towers"
+    ],
+    "recovery_time_estimate": "Weeks to months"
+}
+NUCLEAR_PLANTS_CHECK = {
+    "nuclear_facilities_nearby": 0,  # More realistic
+    "closest_facility_distance_km": 500,
+    "safety_concerns": "Low",
+    "recommendation": "Standard monitoring"
+}
+EVACUATION_ZONES = {
+    "immediate_evacuation": "50 km radius",
+    "secondary_zone": "50-150 km radius",
+    "monitoring_zone": "150-300 km radius"
+}
+OVERALL_RISK_ENERGY_THRESHOLDS = (10, 100)
+# Location-aware variant: base risk indexed by [energy bucket][distance bucket]
+BASE_RISK_DISTANCE_THRESHOLDS_AU = (0.01, 0.05)
+BASE_RISK_MATRIX = (
+    (1, 1, 1),  # <= 10 Mt: LOW at any distance
+    (5, 4, 2),  # <= 100 Mt: EXTREME, VERY_HIGH, MEDIUM
+    (5, 4, 3),  # > 100 Mt: EXTREME, VERY_HIGH, HIGH
+)
+BASE_RISK_LEVELS = ("MINIMAL", "LOW", "MEDIUM", "HIGH", "VERY_HIGH", "EXTREME")
+PRIMARY_HAZARD_ENERGY_THRESHOLDS = (10, 100)
+# Indexed by [is_ocean][energy bucket]
+PRIMARY_HAZARDS = (
+    ("GROUND_IMPACT", "GROUND_IMPACT", "SEISMIC_HAZARDS"),
+    ("OCEAN_IMPACT", "TSUNAMI", "TSUNAMI"),
+)
+
+def _volcanic_trigger_risk(energy: float, active_volcanoes_count: int) -> Dict:
+    bucket = bisect.bisect_left(VOLCANIC_ENERGY_THRESHOLDS, energy) if active_volcanoes_count > 0 else 0
+    risk_level, probability = VOLCANIC_RISK_LEVELS[bucket]
     
     return {
         "risk_level": risk_level,
@@ -620,12 +363,8 @@ def assess_volcanic_trigger_risk(lat: float, lng: float, asteroid: Dict):
         "recommendation": "Monitor volcanic activity" if active_volcanoes_count > 0 else "No immediate concern"
     }
 
-def estimate_ash_fall(lat: float, lng: float, asteroid: Dict):
-    """Estimate ash fall"""
-    energy = asteroid['energy_megatons_TNT']
-    volcanoes_data = get_nearby_volcanoes(lat, lng, radius_km=500)
-    
-    if volcanoes_data['active_volcanoes_count'] == 0:
+def _ash_fall(energy: float, active_volcanoes_count: int) -> Dict:
+    if active_volcanoes_count == 0:
         return {
             "ash_fall_expected": False,
             "reason": "No active volcanoes in the area"
@@ -633,48 +372,22 @@ def estimate_ash_fall(lat: float, lng: float, asteroid: Dict):
     
     return {
         "ash_fall_expected": True,
-        "risk_level": "HIGH" if energy > 500 else "MEDIUM" if energy > 100 else "LOW",
+        "risk_level": ASH_FALL_RISK_LEVELS[bisect.bisect_left(ASH_FALL_ENERGY_THRESHOLDS, energy)],
         "affected_radius_km": 200,
         "health_warning": "Wear masks outdoors"
     }
 
-def calculate_tsunami_risk(lat: float, lng: float, asteroid: Dict):
-    """Calculate ACCURATE tsunami risk"""
-    is_ocean = location_analyzer.is_ocean_location(lat, lng)
-    energy = asteroid['energy_megatons_TNT']
-    
+def _tsunami_risk(energy: float, is_ocean: bool, distance_to_coast: Optional[float]) -> Dict:
     if not is_ocean:
-        return {
-            "tsunami_expected": False,
-            "risk_level": "NONE",
-            "reason": "Land impact - no tsunami generation",
-            "coastal_warnings_needed": False,
-            "evacuation_recommended": False
-        }
+        return dict(TSUNAMI_LAND_RISK)
     
     # Ocean impact - calculate tsunami potential
-    distance_to_coast = calculate_distance_to_coast(lat, lng)
-    
-    if energy > 100:
-        risk_level = "EXTREME"
-        tsunami_expected = True
-        evacuation = True
-        warning = f"Catastrophic tsunami - {distance_to_coast}km to nearest coast"
-    elif energy > 10:
-        risk_level = "HIGH"
-        tsunami_expected = True
-        evacuation = True
-        warning = f"Major tsunami possible - coastal areas at risk"
-    elif energy > 1:
-        risk_level = "MEDIUM"
-        tsunami_expected = True
-        evacuation = distance_to_coast < 500
-        warning = f"Moderate tsunami - monitor coastal warnings"
-    else:
-        risk_level = "LOW"
-        tsunami_expected = True  # Still create waves, just small
-        evacuation = False
-        warning = f"Small waves expected - minimal coastal impact"
+    risk_level, evacuation_distance_km, warning = TSUNAMI_RISK_LEVELS[
+        bisect.bisect_left(TSUNAMI_ENERGY_THRESHOLDS, energy)
+    ]
+    tsunami_expected = True  # Even small impacts still create waves
+    evacuation = distance_to_coast < evacuation_distance_km
+    warning = warning.format(distance_to_coast=distance_to_coast)
     
     return {
         "tsunami_expected": tsunami_expected,
@@ -686,33 +399,11 @@ def calculate_tsunami_risk(lat: float, lng: float, asteroid: Dict):
         "estimated_arrival_time_minutes": int(distance_to_coast / 8)  # ~800 km/h tsunami speed
     }
 
-def estimate_tsunami_wave_height(asteroid: Dict, lat: float, lng: float):
-    """Estimate tsunami wave height"""
-    energy = asteroid['energy_megatons_TNT']
-    is_ocean = location_analyzer.is_ocean_location(lat, lng)
-    
+def _tsunami_wave_height(energy: float, is_ocean: bool) -> Dict:
     if not is_ocean:
-        return {
-            "wave_height_m": 0,
-            "classification": "No tsunami",
-            "reason": "Land impact - no significant water displacement"
-        }
+        return dict(TSUNAMI_LAND_WAVE_HEIGHT)
     
-    if energy > 1000:
-        wave_height = "50-100+"
-        classification = "Mega-tsunami"
-    elif energy > 100:
-        wave_height = "10-50"
-        classification = "Major tsunami"
-    elif energy > 10:
-        wave_height = "3-10"
-        classification = "Moderate tsunami"
-    elif energy > 1:
-        wave_height = "1-3"
-        classification = "Small tsunami"
-    else:
-        wave_height = "0.5-1"
-        classification = "Very small waves"
+    wave_height, classification = TSUNAMI_WAVE_HEIGHTS[bisect.bisect_left(TSUNAMI_WAVE_ENERGY_THRESHOLDS, energy)]
     
     return {
         "wave_height_m": wave_height,
@@ -721,23 +412,9 @@ def estimate_tsunami_wave_height(asteroid: Dict, lat: float, lng: float):
     }
 
 def calculate_impact_induced_quakes(asteroid):
-    """Calculate impact-induced earthquakes"""
+    """Calculate impact-induced earthquakes (shared prebuilt dict, do not mutate)"""
     energy = asteroid['energy_megatons_TNT']
-    
-    if energy > 1000:
-        magnitude = "7.0-8.0"
-    elif energy > 100:
-        magnitude = "6.0-7.0"
-    elif energy > 10:
-        magnitude = "5.0-6.0"
-    else:
-        magnitude = "4.0-5.0"
-    
-    return {
-        "max_magnitude": magnitude,
-        "duration_hours": "2-6",
-        "aftershocks_expected": True
-    }
+    return INDUCED_QUAKE_RESULTS[bisect.bisect_left(SEISMIC_ENERGY_THRESHOLDS, energy)]
 
 def calculate_shaking_radius(asteroid):
     """Calculate ground shaking radius"""
@@ -747,15 +424,7 @@ def calculate_shaking_radius(asteroid):
 def calculate_ground_shaking_intensity(asteroid):
     """Calculate ground shaking intensity"""
     energy = asteroid['energy_megatons_TNT']
-    
-    if energy > 1000:
-        return "IX-X"
-    elif energy > 100:
-        return "VII-IX"
-    elif energy > 10:
-        return "VI-VII"
-    else:
-        return "V-VI"
+    return SEISMIC_INTENSITIES[bisect.bisect_left(SEISMIC_ENERGY_THRESHOLDS, energy)]
 
 def calculate_shockwave_radius(asteroid):
     """Calculate shockwave radius"""
@@ -768,21 +437,9 @@ def calculate_heat_radius(asteroid):
     return energy * 1.5
 
 def estimate_debris_cloud(asteroid):
-    """Estimate debris cloud effects"""
+    """Estimate debris cloud effects (shared prebuilt dict, do not mutate)"""
     energy = asteroid['energy_megatons_TNT']
-    
-    if energy > 1000:
-        climate_impact = "Global cooling for years"
-    elif energy > 100:
-        climate_impact = "Regional climate effects"
-    else:
-        climate_impact = "Localized effects only"
-    
-    return {
-        "altitude_km": "20-50",
-        "climate_impact": climate_impact,
-        "duration": "Months to years"
-    }
+    return DEBRIS_CLOUD_RESULTS[bisect.bisect_left(DEBRIS_CLOUD_ENERGY_THRESHOLDS, energy)]
 
 def assess_wildfire_risk(lat: float, lng: float, asteroid):
     """Assess wildfire risk"""
@@ -801,70 +458,50 @@ def assess_landslide_risk(lat: float, lng: float):
     }
 
 def estimate_infrastructure_impact(lat: float, lng: float):
-    """Estimate infrastructure damage"""
-    return {
-        "critical_infrastructure_at_risk": [
-            "Power grids",
-            "Water treatment plants",
-            "Transportation networks",
-            "Communication towers"
-        ],
-        "recovery_time_estimate": "Weeks to months"
-    }
+    """Estimate infrastructure damage (shared prebuilt dict, do not mutate)"""
+    return INFRASTRUCTURE_IMPACT
 
 def check_nearby_nuclear_plants(lat: float, lng: float):
-    """Check nearby nuclear facilities"""
-    return {
-        "nuclear_facilities_nearby": 0,  # More realistic
-        "closest_facility_distance_km": 500,
-        "safety_concerns": "Low",
-        "recommendation": "Standard monitoring"
-    }
+    """Check nearby nuclear facilities (shared prebuilt dict, do not mutate)"""
+    return NUCLEAR_PLANTS_CHECK
 
-def calculate_overall_risk_level(asteroid, lat: float, lng: float):
-    """Calculate overall risk level"""
-    energy = asteroid['energy_megatons_TNT']
-    distance_au = asteroid['miss_distance_km'] / 149597870.7
-    
-    if distance_au <= 0.01 and energy > 10:
-        return "EXTREME"
-    elif distance_au <= 0.05 and energy > 10:
-        return "VERY_HIGH"
-    elif energy > 100:
-        return "HIGH"
-    elif energy > 10:
-        return "MEDIUM"
-    else:
-        return "LOW"
+def _primary_hazard(energy: float, is_ocean: bool) -> str:
+    return PRIMARY_HAZARDS[int(is_ocean)][bisect.bisect_left(PRIMARY_HAZARD_ENERGY_THRESHOLDS, energy)]
 
-def identify_primary_hazard(lat: float, lng: float, asteroid):
-    """Identify primary hazard"""
+def compute_hazards_bundle(asteroid: Dict, lat: float, lng: float) -> Dict:
+    """All location-dependent hazards from one ocean lookup and one volcano lookup"""
     energy = asteroid['energy_megatons_TNT']
     is_ocean = location_analyzer.is_ocean_location(lat, lng)
+    distance_to_coast = calculate_distance_to_coast(lat, lng) if is_ocean else None
+    nearby_volcanoes = get_nearby_volcanoes(lat, lng, radius_km=500)
+    
+    # The 300 km trigger radius is a subset of the 500 km search
+    active_within_500 = nearby_volcanoes.get('active_volcanoes_count', 0)
+    active_within_300 = int(np.count_nonzero(VOLCANO_ACTIVE & (_volcano_distances(lat, lng) <= 300)))
     
-    if is_ocean and energy > 10:
-        return "TSUNAMI"
-    elif energy > 100:
-        return "SEISMIC_HAZARDS"
-    elif is_ocean:
-        return "OCEAN_IMPACT"
-    else:
-        return "GROUND_IMPACT"
-
-def get_evacuation_zones(lat: float, lng: float):
-    """Get evacuation zones"""
     return {
-        "immediate_evacuation": "50 km radius",
-        "secondary_zone": "50-150 km radius",
-        "monitoring_zone": "150-300 km radius"
+        "is_ocean": is_ocean,
+        "nearby_volcanoes": nearby_volcanoes,
+        "eruption_trigger_risk": _volcanic_trigger_risk(energy, active_within_300),
+        "ash_fall_prediction": _ash_fall(energy, active_within_500),
+        "tsunami_risk": _tsunami_risk(energy, is_ocean, distance_to_coast),
+        "wave_height_prediction": _tsunami_wave_height(energy, is_ocean),
+        "overall_risk_level": _overall_risk_level_improved(
+            energy, asteroid['distance_au'], is_ocean, distance_to_coast
+        ),
+        "most_dangerous_hazard": _primary_hazard(energy, is_ocean)
     }
 
+def get_evacuation_zones(lat: float, lng: float):
+    """Get evacuation zones (shared prebuilt dict, do not mutate)"""
+    return EVACUATION_ZONES
+
 # =============================
 # API ENDPOINTS
 # =============================
 
 @app.get("/")
-async def root():
+def root():
     """API Information with Threat Level"""
     threats = validate_and_identify_threats()
     critical_threats = [t for t in threats if t['threat_level'] == "CRITICAL"]
@@ -873,7 +510,7 @@ async def root():
         "name": "NASA NEO Threat Assessment System",
         "version": "4.0.0",
         "threat_status": {
-            "total_asteroids": len(db.get_all_asteroids()),
+            "total_asteroids": len(db.get_all_asteroids(columns=['id'])),
             "potential_threats": len(threats),
             "critical_threats": len(critical_threats),
             "global_risk_level": "HIGH" if critical_threats else "MEDIUM" if threats else "LOW"
@@ -888,7 +525,7 @@ async def root():
         }
     }
 @app.get("/asteroids/timeframe-prediction")
-async def get_asteroids_by_timeframe(
+def get_asteroids_by_timeframe(
     years: int = Query(10, ge=1, le=100),
     threat_level: str = Query("ALL")
 ):
@@ -902,7 +539,7 @@ async def get_asteroids_by_timeframe(
     predicted_threats = []
     
     for idx, asteroid in df.iterrows():
-        distance_au = asteroid['miss_distance_km'] / 149597870.7
+        distance_au = asteroid['distance_au']
         
         # توزيع حسب المسافة
         if distance_au <= 0.05:
@@ -960,25 +597,18 @@ async def get_asteroids_by_timeframe(
     
    
 @app.get("/asteroids/threats/immediate")
-async def get_immediate_threats():
+def get_immediate_threats():
     """Get asteroids with immediate threat (within 0.01 AU)"""
     df = db.get_all_asteroids()
     
     if df.empty:
         return {"threats": [], "message": "No asteroid data available"}
     
-    immediate_threats = []
-    
-    for idx, asteroid in df.iterrows():
-        distance_au = asteroid['miss_distance_km'] / 149597870.7
-        
-        if distance_au <= 0.01:
-            immediate_threats.append({
-                **asteroid.to_dict(),
-                'distance_au': round(distance_au, 6),
-                'threat_level': 'CRITICAL',
-                'closest_approach_date': asteroid['date']
-            })
+    threats = df.loc[df['distance_au'].to_numpy() <= 0.01].copy()
+    threats['distance_au'] = np.round(threats['distance_au'].to_numpy(), 6)
+    threats['threat_level'] = 'CRITICAL'
+    threats['closest_approach_date'] = threats['date']
+    immediate_threats = threats.to_dict('records')
     
     return {
         "count": len(immediate_threats),
@@ -988,7 +618,7 @@ async def get_immediate_threats():
 
     
 @app.get("/asteroids/raw")
-async def get_raw_data(
+def get_raw_data(
     limit: Optional[int] = Query(None, description="Limit number of results"),
     hazardous_only: bool = Query(False, description="Show only hazardous asteroids"),
     include_defense: bool = Query(False, description="Include defense strategies")
@@ -999,44 +629,42 @@ async def get_raw_data(
     if df.empty:
         raise HTTPException(status_code=404, detail="No asteroid data available")
     
-    # Filter potentially hazardous asteroids
+    # Filter potentially hazardous asteroids; the mask is reused for hazardous_count
+    distance_au = df['distance_au'].to_numpy()
+    hazardous = distance_au <= 0.05
     if hazardous_only:
-        df = df[df['miss_distance_km'] / 149597870.7 <= 0.05]
+        df = df[hazardous]
+        distance_au = distance_au[hazardous]
+        hazardous = hazardous[hazardous]
     
     if limit:
         df = df.head(limit)
+        distance_au = distance_au[:limit]
+        hazardous = hazardous[:limit]
+    
+    if include_defense:
+        threat_levels = classify_threat(distance_au)
+        defense_by_row = defense_strategies.get_defense_strategies_batch(df, threat_levels)
     
     # Add spectral classification and defense to each asteroid
-    asteroids_data = []
-    for _, asteroid in df.iterrows():
-        asteroid_dict = asteroid.to_dict()
-        
-        # Add spectral classification
-        spectral_classification = asteroid_classifier.classify_asteroid(asteroid_dict['id'])
-        asteroid_dict['spectral_classification'] = spectral_classification
+    asteroids_data = df.to_dict('records')
+    classifications = asteroid_classifier.classify_asteroid_batch(df['id'].to_numpy())
+    for row, asteroid_dict in enumerate(asteroids_data):
+        asteroid_dict['spectral_classification'] = classifications[row]
         
         # Add defense strategies if requested
         if include_defense:
-            distance_au = asteroid_dict['miss_distance_km'] / 149597870.7
-            threat_level = "CRITICAL" if distance_au <= 0.01 else "HIGH" if distance_au <= 0.05 else "LOW"
-            
-            defense_analysis = defense_strategies.get_defense_strategies(
-                asteroid_dict,
-                {"threat_level": threat_level}
-            )
-            asteroid_dict['defense_strategies'] = defense_analysis
-        
-        asteroids_data.append(asteroid_dict)
+            asteroid_dict['defense_strategies'] = defense_by_row[row]
     
     return {
         "count": len(asteroids_data),
-        "hazardous_count": len(df[df['miss_distance_km'] / 149597870.7 <= 0.05]),
+        "hazardous_count": int(np.count_nonzero(hazardous)),
         "include_defense": include_defense,
         "data": asteroids_data
     }
 
 @app.get("/asteroids/by-name/{asteroid_name}")
-async def get_asteroid_by_name(asteroid_name: str):
+def get_asteroid_by_name(asteroid_name: str):
     """Get specific asteroid data by name"""
     df = db.get_all_asteroids()
     
@@ -1078,29 +706,73 @@ async def get_asteroid_by_name(asteroid_name: str):
 #             "reason": "Inland location - no direct coastal impact",
 #             "nearest_coast_distance_km": 0
 #         }
+COASTAL_POINTS = np.array([
+    (40.7, -74.0), (34.0, -118.2), (25.8, -80.2), (47.6, -122.3),
+    (-34.6, -58.4), (-23.5, -46.6), (-33.4, -70.7),
+    (51.5, -0.1), (43.3, -8.4), (41.9, 12.5),
+    (33.6, -7.6), (-33.9, 18.4),
+    (35.7, 139.7), (22.3, 114.2), (1.3, 103.8),
+    (-33.9, 151.2), (-37.8, 144.9), (-41.3, 174.8), (-43.5, 172.6)
+])
+COASTAL_LATS_RAD = np.radians(COASTAL_POINTS[:, 0])
+COASTAL_LNGS_RAD = np.radians(COASTAL_POINTS[:, 1])
+COASTAL_COS_LATS = np.cos(COASTAL_LATS_RAD)
+
+@lru_cache(maxsize=4096)
 def calculate_distance_to_coast(lat: float, lng: float) -> float:
-    """Calculate approximate distance to nearest coastline"""
+    """Calculate approximate distance to nearest coastline (cached per site; hazard helpers share it)"""
     is_ocean = location_analyzer.is_ocean_location(lat, lng)
     
     if is_ocean:
-        coastal_points = [
-            (40.7, -74.0), (34.0, -118.2), (25.8, -80.2), (47.6, -122.3),
-            (-34.6, -58.4), (-23.5, -46.6), (-33.4, -70.7),
-            (51.5, -0.1), (43.3, -8.4), (41.9, 12.5),
-            (33.6, -7.6), (-33.9, 18.4),
-            (35.7, 139.7), (22.3, 114.2), (1.3, 103.8),
-            (-33.9, 151.2), (-37.8, 144.9), (-41.3, 174.8), (-43.5, 172.6)
-        ]
-        
-        min_distance = float('inf')
-        for coast_lat, coast_lng in coastal_points:
-            distance = calculate_distance(lat, lng, coast_lat, coast_lng)
-            min_distance = min(min_distance, distance)
-        
-        return round(min_distance, 1)
+        distances = _haversine_many(lat, lng, COASTAL_LATS_RAD, COASTAL_LNGS_RAD, COASTAL_COS_LATS)
+        return round(float(distances.min()), 1)
     else:
         return 0.0
 
+# Lower bounds (exclusive) of each coastal energy bucket and the values for each bucket
+COASTAL_IMPACT_ENERGY_THRESHOLDS = (1, 10, 100)
+# (severity, affected coastlines, evacuation radius km)
+COASTAL_TSUNAMI_SEVERITIES = (
+    ("MINOR", "Very local", 50),
+    ("MODERATE", "Local", 100),
+    ("SEVERE", "Regional", 500),
+    ("CATASTROPHIC", "Multiple continents", 1000),
+)
+INUNDATION_ENERGY_THRESHOLDS = (10, 100)
+# (zones, total affected area km2); the zone lists are shared, do not mutate
+INUNDATION_ZONES = (
+    ([
+        {
+            "zone_type": "Low Risk",
+            "distance_from_shore_km": "0-2",
+            "risk_level": "MODERATE",
+            "actions": "Stay alert, move inland if warnings issued"
+        }
+    ], 1000),
+    ([
+        {
+            "zone_type": "High Risk",
+            "distance_from_shore_km": "0-3",
+            "risk_level": "SEVERE",
+            "actions": "IMMEDIATE EVACUATION required"
+        }
+    ], 5000),
+    ([
+        {
+            "zone_type": "Immediate Destruction",
+            "distance_from_shore_km": "0-5",
+            "risk_level": "EXTREME",
+            "actions": "IMMEDIATE EVACUATION - Move to high ground >50m elevation"
+        },
+        {
+            "zone_type": "High Risk",
+            "distance_from_shore_km": "5-15",
+            "risk_level": "SEVERE",
+            "actions": "Evacuate within 1 hour"
+        }
+    ], 15000),
+)
+
 def assess_coastal_impact(lat: float, lng: float, asteroid_energy: float) -> Dict:
     """Assess coastal impact based on location and asteroid energy"""
     is_ocean = location_analyzer.is_ocean_location(lat, lng)
@@ -1116,22 +788,9 @@ def assess_coastal_impact(lat: float, lng: float, asteroid_energy: float) -> Dic
     
     distance_to_coast = calculate_distance_to_coast(lat, lng)
     
-    if asteroid_energy > 100:
-        tsunami_severity = "CATASTROPHIC"
-        affected_coastlines = "Multiple continents"
-        evacuation_radius_km = 1000
-    elif asteroid_energy > 10:
-        tsunami_severity = "SEVERE"
-        affected_coastlines = "Regional"
-        evacuation_radius_km = 500
-    elif asteroid_energy > 1:
-        tsunami_severity = "MODERATE"
-        affected_coastlines = "Local"
-        evacuation_radius_km = 100
-    else:
-        tsunami_severity = "MINOR"
-        affected_coastlines = "Very local"
-        evacuation_radius_km = 50
+    tsunami_severity, affected_coastlines, evacuation_radius_km = COASTAL_TSUNAMI_SEVERITIES[
+        bisect.bisect_left(COASTAL_IMPACT_ENERGY_THRESHOLDS, asteroid_energy)
+    ]
     
     return {
         "coastal_impact_expected": True,
@@ -1158,42 +817,7 @@ def identify_inundation_zones(lat: float, lng: float, asteroid_energy: float) ->
             "affected_area_km2": 0
         }
     
-    if asteroid_energy > 100:
-        zones = [
-            {
-                "zone_type": "Immediate Destruction",
-                "distance_from_shore_km": "0-5",
-                "risk_level": "EXTREME",
-                "actions": "IMMEDIATE EVACUATION - Move to high ground >50m elevation"
-            },
-            {
-                "zone_type": "High Risk",
-                "distance_from_shore_km": "5-15",
-                "risk_level": "SEVERE",
-                "actions": "Evacuate within 1 hour"
-            }
-        ]
-        total_affected_area = 15000
-    elif asteroid_energy > 10:
-        zones = [
-            {
-                "zone_type": "High Risk",
-                "distance_from_shore_km": "0-3",
-                "risk_level": "SEVERE",
-                "actions": "IMMEDIATE EVACUATION required"
-            }
-        ]
-        total_affected_area = 5000
-    else:
-        zones = [
-            {
-                "zone_type": "Low Risk",
-                "distance_from_shore_km": "0-2",
-                "risk_level": "MODERATE",
-                "actions": "Stay alert, move inland if warnings issued"
-            }
-        ]
-        total_affected_area = 1000
+    zones, total_affected_area = INUNDATION_ZONES[bisect.bisect_left(INUNDATION_ENERGY_THRESHOLDS, asteroid_energy)]
     
     return {
         "inundation_risk": "HIGH",
@@ -1214,14 +838,14 @@ def calculate_real_ocean_distance(lat: float, lng: float) -> float:
     else:
         return 800   # مسافة متوسطة
 @app.get("/asteroids/{asteroid_id}")
-async def get_asteroid_by_id(asteroid_id: int):
+def get_asteroid_by_id(asteroid_id: int):
     """Get complete information for specific asteroid including spectral type and defense strategies"""
     asteroid = db.get_asteroid_by_id(asteroid_id)
     
     if not asteroid:
         raise HTTPException(status_code=404, detail="Asteroid not found")
     
-    distance_au = asteroid['miss_distance_km'] / 149597870.7
+    distance_au = asteroid['distance_au']
     mass = physics.calculate_mass(asteroid['diameter_avg'])
     energy = physics.calculate_kinetic_energy(mass, asteroid['velocity_km_s'])
     
@@ -1230,7 +854,7 @@ async def get_asteroid_by_id(asteroid_id: int):
     
     # Add defense strategies
     threat_assessment_data = {
-        "threat_level": "CRITICAL" if distance_au <= 0.01 else "HIGH" if distance_au <= 0.05 else "LOW"
+        "threat_level": classify_threat_scalar(distance_au)
     }
     defense_analysis = defense_strategies.get_defense_strategies(
         asteroid,
@@ -1267,7 +891,7 @@ async def get_asteroid_by_id(asteroid_id: int):
         "defense_strategies": defense_analysis
     }
 @app.get("/asteroids/threats/all")
-async def get_all_threats():
+def get_all_threats():
     """Get all potentially hazardous asteroids"""
     threats = validate_and_identify_threats()
     
@@ -1286,7 +910,7 @@ async def get_impact_analysis(asteroid_id: int):
     if not asteroid:
         raise HTTPException(status_code=404, detail="Asteroid not found")
     
-    distance_au = asteroid['miss_distance_km'] / 149597870.7
+    distance_au = asteroid['distance_au']
     
     if distance_au > 0.05:
         return {
@@ -1298,23 +922,22 @@ async def get_impact_analysis(asteroid_id: int):
         }
     
     impact_lat, impact_lng = generate_impact_site(asteroid_id)
-    seismic_analysis = usgs_analyzer.calculate_seismic_risk(impact_lat, impact_lng)
     
     mass = physics.calculate_mass(asteroid['diameter_avg'])
     energy = physics.calculate_kinetic_energy(mass, asteroid['velocity_km_s'])
     impact_effects = physics.calculate_impact_effects(energy['energy_megatons_TNT'])
     
-    impact_analysis = location_analyzer.analyze_impact({
-        **asteroid,
-        "impact_lat": impact_lat,
-        "impact_lng": impact_lng
-    })
+    # USGS and reverse geocoding are independent network calls
+    seismic_analysis, impact_analysis = await asyncio.gather(
+        asyncio.to_thread(usgs_analyzer.calculate_seismic_risk, impact_lat, impact_lng),
+        location_analyzer.analyze_impact_async(asteroid, impact_lat, impact_lng)
+    )
     
     return {
         "asteroid": asteroid['name'],
         "threat_assessment": {
             "distance_au": round(distance_au, 6),
-            "threat_level": "CRITICAL" if distance_au <= 0.01 else "HIGH",
+            "threat_level": classify_threat_scalar(distance_au),
             "is_potentially_hazardous": True
         },
         "impact_prediction": {
@@ -1343,7 +966,13 @@ async def get_natural_hazards_analysis(asteroid_id: int):
         raise HTTPException(status_code=404, detail="Asteroid not found")
     
     impact_lat, impact_lng = generate_impact_site(asteroid_id)
-    is_ocean = location_analyzer.is_ocean_location(impact_lat, impact_lng)
+    # The USGS request is the only slow part: submit it to the executor now (run_in_executor
+    # starts the thread immediately) and build the rest while it runs
+    seismic_future = asyncio.get_running_loop().run_in_executor(
+        None, usgs_analyzer.calculate_seismic_risk, impact_lat, impact_lng
+    )
+    hazards = compute_hazards_bundle(asteroid, impact_lat, impact_lng)
+    is_ocean = hazards['is_ocean']
     energy = asteroid['energy_megatons_TNT']
     
     # Calculate coastal impact properly
@@ -1370,6 +999,8 @@ async def get_natural_hazards_analysis(asteroid_id: int):
             "nuclear_facilities_risk": check_nearby_nuclear_plants(impact_lat, impact_lng)
         }
     
+    earthquake_risk = await seismic_future
+    
     return {
         "asteroid_info": {
             "id": asteroid_id,
@@ -1380,7 +1011,7 @@ async def get_natural_hazards_analysis(asteroid_id: int):
         },
         
         "seismic_hazards": {
-            "earthquake_risk": usgs_analyzer.calculate_seismic_risk(impact_lat, impact_lng),
+            "earthquake_risk": earthquake_risk,
             "induced_earthquakes": calculate_impact_induced_quakes(asteroid),
             "ground_shaking": {
                 "intensity": calculate_ground_shaking_intensity(asteroid),
@@ -1390,14 +1021,14 @@ async def get_natural_hazards_analysis(asteroid_id: int):
         },
         
         "volcanic_hazards": {
-            "nearby_volcanoes": get_nearby_volcanoes(impact_lat, impact_lng, radius_km=500),
-            "eruption_trigger_risk": assess_volcanic_trigger_risk(impact_lat, impact_lng, asteroid),
-            "ash_fall_prediction": estimate_ash_fall(impact_lat, impact_lng, asteroid)
+            "nearby_volcanoes": hazards['nearby_volcanoes'],
+            "eruption_trigger_risk": hazards['eruption_trigger_risk'],
+            "ash_fall_prediction": hazards['ash_fall_prediction']
         },
         
         "tsunami_hazards": {
-            "tsunami_risk": calculate_tsunami_risk(impact_lat, impact_lng, asteroid),
-            "wave_height_prediction": estimate_tsunami_wave_height(asteroid, impact_lat, impact_lng),
+            "tsunami_risk": hazards['tsunami_risk'],
+            "wave_height_prediction": hazards['wave_height_prediction'],
             "coastal_impact": coastal_analysis,  # Fixed
             "inundation_zones": inundation_analysis  # Fixed
         },
@@ -1411,8 +1042,8 @@ async def get_natural_hazards_analysis(asteroid_id: int):
         "secondary_hazards": secondary_hazards,  # Context-aware
         
         "combined_risk_assessment": {
-            "overall_risk_level": calculate_overall_risk_level_improved(asteroid, impact_lat, impact_lng),
-            "most_dangerous_hazard": identify_primary_hazard(impact_lat, impact_lng, asteroid),
+            "overall_risk_level": hazards['overall_risk_level'],
+            "most_dangerous_hazard": hazards['most_dangerous_hazard'],
             "evacuation_priority_zones": get_evacuation_zones_improved(impact_lat, impact_lng, energy, is_ocean),
             "emergency_response_time": "Immediate"
         }
@@ -1459,33 +1090,20 @@ def estimate_infrastructure_damage_cost(energy: float, distance_km: float) -> st
     else:
         return f"${total_damage/1e6:.1f} million"
 
-def calculate_overall_risk_level_improved(asteroid: Dict, lat: float, lng: float) -> str:
-    """Improved risk level calculation considering location"""
-    energy = asteroid['energy_megatons_TNT']
-    distance_au = asteroid['miss_distance_km'] / 149597870.7
-    is_ocean = location_analyzer.is_ocean_location(lat, lng)
-    
+def _overall_risk_level_improved(energy: float, distance_au: float, is_ocean: bool,
+                                 distance_to_coast: Optional[float]) -> str:
     # Base risk from energy and distance
-    if distance_au <= 0.01 and energy > 10:
-        base_risk = 5  # EXTREME
-    elif distance_au <= 0.05 and energy > 10:
-        base_risk = 4  # VERY_HIGH
-    elif energy > 100:
-        base_risk = 3  # HIGH
-    elif energy > 10:
-        base_risk = 2  # MEDIUM
-    else:
-        base_risk = 1  # LOW
+    base_risk = BASE_RISK_MATRIX[bisect.bisect_left(OVERALL_RISK_ENERGY_THRESHOLDS, energy)][
+        bisect.bisect_left(BASE_RISK_DISTANCE_THRESHOLDS_AU, distance_au)
+    ]
     
     # Adjust for location
     if is_ocean and energy > 1:
         # Ocean impacts create tsunami risk
-        distance_to_coast = calculate_distance_to_coast(lat, lng)
         if distance_to_coast < 1000:
             base_risk = min(5, base_risk + 1)  # Increase risk if near populated coasts
     
-    risk_levels = ["MINIMAL", "LOW", "MEDIUM", "HIGH", "VERY_HIGH", "EXTREME"]
-    return risk_levels[min(base_risk, 5)]
+    return BASE_RISK_LEVELS[min(base_risk, 5)]
 
 def get_evacuation_zones_improved(lat: float, lng: float, energy: float, is_ocean: bool) -> Dict:
     """Context-aware evacuation zones"""
@@ -1536,7 +1154,7 @@ def get_evacuation_zones_improved(lat: float, lng: float, energy: float, is_ocea
         }
 
 @app.get("/asteroids/validation-report")
-async def get_validation_report():
+def get_validation_report():
     """Comprehensive data validation report"""
     df = db.get_all_asteroids()
     
@@ -1555,22 +1173,35 @@ async def get_validation_report():
         }
     }
     
-    for idx, asteroid in df.iterrows():
-        if asteroid['diameter_avg'] <= 0:
-            validation_results['data_quality_issues'].append(f"Invalid diameter: {asteroid['name']}")
-        
-        if asteroid['miss_distance_km'] <= 1000:
-            validation_results['data_quality_issues'].append(f"Unrealistically close: {asteroid['name']}")
+    invalid_diameter = df['diameter_avg'].to_numpy() <= 0
+    too_close = df['miss_distance_km'].to_numpy() <= 1000
+    names = df['name'].to_numpy()
+    
+    # Visit only flagged rows, keeping the per-asteroid order of the issues
+    issues = validation_results['data_quality_issues']
+    for i in np.flatnonzero(invalid_diameter | too_close).tolist():
+        if invalid_diameter[i]:
+            issues.append(f"Invalid diameter: {names[i]}")
+        if too_close[i]:
+            issues.append(f"Unrealistically close: {names[i]}")
     
     return validation_results
 
 @app.get("/usgs/earthquakes/nearby")
-async def get_nearby_earthquakes(
+def get_nearby_earthquakes(
     lat: float = Query(40.7128, description="Latitude"),
     lng: float = Query(-74.0060, description="Longitude"), 
-    radius_km: float = Query(500, description="Search radius in kilometers")
+    radius_km: float = Query(500, description="Search radius in kilometers"),
+    include_events: bool = Query(True, description="Include the earthquake list (skips the extra USGS query when false)")
 ):
     """Get earthquakes near impact prediction"""
+    if not include_events:
+        return {
+            "impact_prediction_location": [lat, lng],
+            "search_radius_km": radius_km,
+            "seismic_risk_assessment": usgs_analyzer.calculate_seismic_risk(lat, lng)
+        }
+    
     earthquakes = usgs_analyzer.get_earthquakes_near_location(lat, lng, radius_km)
     
     return {
@@ -1581,36 +1212,81 @@ async def get_nearby_earthquakes(
         "earthquakes": earthquakes
     }
 from app.models import UserAsteroidInput, UserImpactAnalysis
+from pydantic import conlist
 
 # =============================
 # USER INPUT APIS
 # =============================
 
+# Results for repeated user payloads. Entries expire because the analysis
+# embeds live USGS seismic data; access only happens on the event loop.
+USER_RESULT_CACHE_SIZE = 4096
+USER_RESULT_TTL_SECONDS = 3600
+_user_impact_cache: "OrderedDict[tuple, Tuple[float, dict]]" = OrderedDict()
+_defense_effectiveness_cache: "OrderedDict[tuple, Tuple[float, dict]]" = OrderedDict()
+
+def _user_cache_get(cache: OrderedDict, key: tuple) -> Optional[dict]:
+    """Private copy of the fresh cached result for key, or None"""
+    entry = cache.get(key)
+    if entry is None:
+        return None
+    stored_at, result = entry
+    if time.monotonic() - stored_at > USER_RESULT_TTL_SECONDS:
+        del cache[key]
+        return None
+    cache.move_to_end(key)
+    return copy.deepcopy(result)
+
+def _user_cache_put(cache: OrderedDict, key: tuple, result: dict) -> None:
+    cache[key] = (time.monotonic(), copy.deepcopy(result))
+    cache.move_to_end(key)
+    if len(cache) > USER_RESULT_CACHE_SIZE:
+        cache.popitem(last=False)
+
+# Sphere volume from diameter: (4/3) * pi * (d/2)^3 = SPHERE_VOLUME_COEF * d^3
+SPHERE_VOLUME_COEF = (4.0 / 3.0) * math.pi / 8.0
+JOULES_PER_MEGATON = 4.184e15
+
+def _compute_mass_energy(user_input: UserAsteroidInput) -> Tuple[float, float]:
+    """(mass_kg, kinetic energy in megatons TNT) for a user-defined asteroid"""
+    if user_input.mass_kg is None:
+        diameter_m = user_input.diameter_km * 1000.0
+        mass = SPHERE_VOLUME_COEF * diameter_m * diameter_m * diameter_m * user_input.density_kg_m3
+    else:
+        mass = user_input.mass_kg
+    velocity_m_s = user_input.velocity_km_s * 1000.0
+    energy_megatons = 0.5 * mass * velocity_m_s * velocity_m_s / JOULES_PER_MEGATON
+    return mass, energy_megatons
+
 @app.post("/user/impact-analysis", response_model=UserImpactAnalysis)
 async def calculate_user_impact_analysis(user_input: UserAsteroidInput):
     """
     Calculate impact analysis based on user input
     """
-    # Calculate mass if not provided
-    if user_input.mass_kg is None:
-        volume = (4/3) * 3.14159 * ((user_input.diameter_km * 1000 / 2) ** 3)  # m³
-        calculated_mass = volume * user_input.density_kg_m3
-    else:
-        calculated_mass = user_input.mass_kg
+    cache_key = tuple(user_input.model_dump().values())
+    cached = _user_cache_get(_user_impact_cache, cache_key)
+    if cached is not None:
+        return cached
     
-    # Calculate kinetic energy
-    energy_joules = 0.5 * calculated_mass * (user_input.velocity_km_s * 1000) ** 2
-    energy_megatons = energy_joules / (4.184 * 10**15)  # Convert to megatons TNT
+    # The USGS lookup is the only slow part: start it now and build the rest meanwhile
+    seismic_future = _submit_seismic_risk(user_input.impact_lat, user_input.impact_lng)
+    
+    # Calculate mass (if not provided) and kinetic energy
+    calculated_mass, energy_megatons = _compute_mass_energy(user_input)
     
     # Calculate impact effects
     impact_effects = physics.calculate_impact_effects(energy_megatons)
     
+    # One ocean lookup shared by the hazards and the risk assessment
+    is_ocean = location_analyzer.is_ocean_location(user_input.impact_lat, user_input.impact_lng)
+    
     # Calculate natural hazards
-    natural_hazards = await calculate_user_natural_hazards(
+    natural_hazards = build_user_natural_hazards(
         user_input.impact_lat, 
         user_input.impact_lng, 
         energy_megatons,
-        user_input.diameter_km
+        user_input.diameter_km,
+        is_ocean
     )
     
     # Generate defense recommendations
@@ -1618,6 +1294,7 @@ async def calculate_user_impact_analysis(user_input: UserAsteroidInput):
         'diameter_avg': user_input.diameter_km,
         'velocity_km_s': user_input.velocity_km_s,
         'miss_distance_km': 0,  # Assuming impact
+        'distance_au': 0,
         'energy_megatons_TNT': energy_megatons
     }
     
@@ -1632,10 +1309,14 @@ async def calculate_user_impact_analysis(user_input: UserAsteroidInput):
         user_input.velocity_km_s,
         energy_megatons,
         user_input.impact_lat,
-        user_input.impact_lng
+        user_input.impact_lng,
+        is_ocean
     )
     
-    return {
+    earthquake_risk, seismic_fetched = await seismic_future
+    natural_hazards["seismic_hazards"]["earthquake_risk"] = earthquake_risk
+    
+    result = {
         "input_data": user_input,
         "calculated_mass": calculated_mass,
         "kinetic_energy_megatons": energy_megatons,
@@ -1644,14 +1325,125 @@ async def calculate_user_impact_analysis(user_input: UserAsteroidInput):
         "defense_recommendations": defense_recommendations,
         "risk_assessment": risk_assessment
     }
+    # A failed USGS fetch reads as a quiet area; don't pin that for the whole TTL
+    if seismic_fetched:
+        _user_cache_put(_user_impact_cache, cache_key, result)
+    
+    return result
+
+# Hard cap on scenarios per batch request, and on USGS lookups in flight at once
+# across all requests (each lookup holds an executor thread for up to 10 s)
+USER_BATCH_MAX_SIZE = 50
+USGS_MAX_CONCURRENT_LOOKUPS = 8
+_usgs_semaphore = asyncio.Semaphore(USGS_MAX_CONCURRENT_LOOKUPS)
+
+async def _bounded_seismic_risk(lat: float, lng: float) -> Tuple[Dict, bool]:
+    async with _usgs_semaphore:
+        return await _submit_seismic_risk(lat, lng)
+
+@app.post("/user/impact-analysis/batch", response_model=List[UserImpactAnalysis])
+async def calculate_user_impact_analysis_batch(
+    user_inputs: conlist(UserAsteroidInput, max_length=USER_BATCH_MAX_SIZE)
+):
+    """
+    Impact analysis for several user scenarios at once (e.g. all suggested locations)
+    """
+    results: List[Optional[dict]] = [None] * len(user_inputs)
+    cache_keys = [tuple(u.model_dump().values()) for u in user_inputs]
+    pending = []
+    for i, cache_key in enumerate(cache_keys):
+        results[i] = _user_cache_get(_user_impact_cache, cache_key)
+        if results[i] is None:
+            pending.append(i)
+    if not pending:
+        return results
+    
+    new_inputs = [user_inputs[i] for i in pending]
+    n = len(new_inputs)
+    diameters = np.fromiter((u.diameter_km for u in new_inputs), dtype=float, count=n)
+    velocities = np.fromiter((u.velocity_km_s for u in new_inputs), dtype=float, count=n)
+    densities = np.fromiter((u.density_kg_m3 for u in new_inputs), dtype=float, count=n)
+    given_masses = np.fromiter(
+        (np.nan if u.mass_kg is None else u.mass_kg for u in new_inputs), dtype=float, count=n
+    )
+    lats = np.fromiter((u.impact_lat for u in new_inputs), dtype=float, count=n)
+    lngs = np.fromiter((u.impact_lng for u in new_inputs), dtype=float, count=n)
+    
+    # The USGS lookups are the slow part: queue them all, and yield once so the
+    # first USGS_MAX_CONCURRENT_LOOKUPS are on the executor before the local work
+    seismic_tasks = [
+        asyncio.ensure_future(_bounded_seismic_risk(lat, lng))
+        for lat, lng in zip(lats.tolist(), lngs.tolist())
+    ]
+    await asyncio.sleep(0)
+    
+    # Same arithmetic as _compute_mass_energy, one pass over all scenarios
+    diameters_m = diameters * 1000.0
+    masses = np.where(
+        np.isnan(given_masses),
+        SPHERE_VOLUME_COEF * diameters_m * diameters_m * diameters_m * densities,
+        given_masses
+    )
+    velocities_m_s = velocities * 1000.0
+    energies = 0.5 * masses * velocities_m_s * velocities_m_s / JOULES_PER_MEGATON
+    
+    risk = calculate_user_risk_assessment_batch(diameters, velocities, energies, lats, lngs)
+    
+    new_results = []
+    for user_input, mass, energy, row in zip(new_inputs, masses.tolist(), energies.tolist(),
+                                             risk.itertuples(index=False)):
+        asteroid_data = {
+            'diameter_avg': user_input.diameter_km,
+            'velocity_km_s': user_input.velocity_km_s,
+            'miss_distance_km': 0,  # Assuming impact
+            'distance_au': 0,
+            'energy_megatons_TNT': energy
+        }
+        new_results.append({
+            "input_data": user_input,
+            "calculated_mass": mass,
+            "kinetic_energy_megatons": energy,
+            "impact_effects": physics.calculate_impact_effects(energy),
+            "natural_hazards": build_user_natural_hazards(
+                user_input.impact_lat, user_input.impact_lng, energy, user_input.diameter_km, row.is_ocean
+            ),
+            "defense_recommendations": defense_strategies.get_defense_strategies(
+                asteroid_data,
+                {"threat_level": "HIGH"}
+            ),
+            "risk_assessment": {
+                "risk_score": row.risk_score,
+                "risk_level": row.risk_level,
+                "factors": {
+                    "size_risk": row.size_risk,
+                    "velocity_risk": row.velocity_risk,
+                    "energy_risk": row.energy_risk,
+                    "location_risk": row.location_risk
+                },
+                "emergency_response": generate_user_emergency_response(row.risk_level, energy, row.is_ocean)
+            }
+        })
+    
+    seismic = await asyncio.gather(*seismic_tasks)
+    for i, result, (earthquake_risk, seismic_fetched) in zip(pending, new_results, seismic):
+        result["natural_hazards"]["seismic_hazards"]["earthquake_risk"] = earthquake_risk
+        if seismic_fetched:
+            _user_cache_put(_user_impact_cache, cache_keys[i], result)
+        results[i] = result
+    
+    return results
+
+# DEFENSE_METHODS is read-only, so the dropdown payload and name lookup are built once
+DEFENSE_STRATEGIES_RESPONSE = {
+    "strategies": [dict(method) for method in defense_strategies.DEFENSE_METHODS.values()],
+    "count": len(defense_strategies.DEFENSE_METHODS)
+}
+DEFENSE_KEY_BY_NAME = {method["name"]: key for key, method in defense_strategies.DEFENSE_METHODS.items()}
 
 @app.get("/user/defense-strategies")
 async def get_all_defense_strategies():
-    """Get all available defense strategies for frontend dropdown"""
-    return {
-        "strategies": list(defense_strategies.DEFENSE_METHODS.values()),
-        "count": len(defense_strategies.DEFENSE_METHODS)
-    }
+    """Get all available defense strategies for frontend dropdown (shared prebuilt dict, do not mutate)"""
+    return DEFENSE_STRATEGIES_RESPONSE
 
 @app.post("/user/defense-effectiveness")
 async def calculate_defense_effectiveness(user_input: UserAsteroidInput):
@@ -1660,20 +1452,20 @@ async def calculate_defense_effectiveness(user_input: UserAsteroidInput):
         raise HTTPException(status_code=400, detail="No defense strategy selected")
     
     # Find the strategy
-    strategy_key = None
-    for key, strategy in defense_strategies.DEFENSE_METHODS.items():
-        if strategy["name"] == user_input.defense_strategy:
-            strategy_key = key
-            break
+    strategy_key = DEFENSE_KEY_BY_NAME.get(user_input.defense_strategy)
     
     if not strategy_key:
         raise HTTPException(status_code=404, detail="Defense strategy not found")
     
+    # Only these inputs feed the calculation below
+    cache_key = (strategy_key, user_input.diameter_km, user_input.velocity_km_s,
+                 user_input.density_kg_m3, user_input.mass_kg)
+    cached = _user_cache_get(_defense_effectiveness_cache, cache_key)
+    if cached is not None:
+        return cached
+    
     # Calculate mass and energy
-    volume = (4/3) * 3.14159 * ((user_input.diameter_km * 1000 / 2) ** 3)
-    calculated_mass = volume * user_input.density_kg_m3
-    energy_joules = 0.5 * calculated_mass * (user_input.velocity_km_s * 1000) ** 2
-    energy_megatons = energy_joules / (4.184 * 10**15)
+    calculated_mass, energy_megatons = _compute_mass_energy(user_input)
     
     # Create mock asteroid data for defense calculation
     asteroid_data = {
@@ -1691,35 +1483,50 @@ async def calculate_defense_effectiveness(user_input: UserAsteroidInput):
         {"threat_level": "HIGH"}
     )
     
-    return {
+    result = {
         "selected_strategy": user_input.defense_strategy,
         "asteroid_energy_megatons": energy_megatons,
         "effectiveness_analysis": enhanced_strategy,
         "mission_feasibility": assess_mission_feasibility(user_input.diameter_km, energy_megatons)
     }
+    _user_cache_put(_defense_effectiveness_cache, cache_key, result)
+    
+    return result
 
 # =============================
 # HELPER FUNCTIONS FOR USER INPUT
 # =============================
 
-async def calculate_user_natural_hazards(lat: float, lng: float, energy_megatons: float, diameter_km: float):
-    """Calculate natural hazards for user-defined asteroid"""
-    is_ocean = location_analyzer.is_ocean_location(lat, lng)
+def _submit_seismic_risk(lat: float, lng: float) -> "asyncio.Future[Tuple[Dict, bool]]":
+    """Start the blocking USGS lookup on the default executor right away (unlike
+    create_task(to_thread(...)), which does not run until the caller awaits).
+    Resolves to (seismic risk, whether the USGS data was actually fetched)"""
+    return asyncio.get_running_loop().run_in_executor(None, usgs_analyzer.calculate_seismic_risk_checked, lat, lng)
+
+def build_user_natural_hazards(lat: float, lng: float, energy_megatons: float, diameter_km: float,
+                               is_ocean: Optional[bool] = None) -> Dict:
+    """Calculate natural hazards for user-defined asteroid (is_ocean is looked up if not given).
+    seismic_hazards.earthquake_risk is left None: the caller starts the USGS lookup
+    with _submit_seismic_risk beforehand and fills it in"""
+    if is_ocean is None:
+        is_ocean = location_analyzer.is_ocean_location(lat, lng)
+    distance_to_coast = calculate_distance_to_coast(lat, lng) if is_ocean else None
     
     mock_asteroid = {
         'energy_megatons_TNT': energy_megatons,
         'diameter_avg': diameter_km,
         'velocity_km_s': 20,  # Default for calculation
-        'miss_distance_km': 0
+        'miss_distance_km': 0,
+        'distance_au': 0
     }
     
     return {
         "seismic_hazards": {
-            "earthquake_risk": usgs_analyzer.calculate_seismic_risk(lat, lng),
+            "earthquake_risk": None,
             "induced_earthquakes": calculate_impact_induced_quakes(mock_asteroid),
             "ground_shaking_intensity": calculate_ground_shaking_intensity(mock_asteroid)
         },
-        "tsunami_risk": calculate_tsunami_risk(lat, lng, mock_asteroid),
+        "tsunami_risk": _tsunami_risk(energy_megatons, is_ocean, distance_to_coast),
         "atmospheric_effects": {
             "shockwave_radius_km": calculate_shockwave_radius(mock_asteroid),
             "heat_blast_radius": calculate_heat_radius(mock_asteroid),
@@ -1728,9 +1535,11 @@ async def calculate_user_natural_hazards(lat: float, lng: float, energy_megatons
         "impact_location_type": "ocean" if is_ocean else "land"
     }
 
-def calculate_user_risk_assessment(diameter: float, velocity: float, energy: float, lat: float, lng: float):
-    """Calculate risk assessment for user-defined asteroid"""
-    is_ocean = location_analyzer.is_ocean_location(lat, lng)
+def calculate_user_risk_assessment(diameter: float, velocity: float, energy: float, lat: float, lng: float,
+                                   is_ocean: Optional[bool] = None):
+    """Calculate risk assessment for user-defined asteroid (is_ocean is looked up if not given)"""
+    if is_ocean is None:
+        is_ocean = location_analyzer.is_ocean_location(lat, lng)
     
     # Calculate risk score (0-100)
     size_score = min(100, diameter * 10)  # 10 km = 100 points
@@ -1767,79 +1576,124 @@ def calculate_user_risk_assessment(diameter: float, velocity: float, energy: flo
         "emergency_response": generate_user_emergency_response(risk_level, energy, is_ocean)
     }
 
-def generate_user_emergency_response(risk_level: str, energy: float, is_ocean: bool):
-    """Generate emergency response for user scenario"""
-    responses = {
-        "EXTREME": [
-            "🚨 IMMEDIATE GLOBAL ALERT - Evacuation required",
-            "🌍 International cooperation essential",
-            "📡 Continuous monitoring and trajectory updates",
-            "🏥 Activate emergency medical response worldwide"
-        ],
-        "VERY_HIGH": [
-            "⚠️ High-priority alert to affected regions",
-            "🏗️ Reinforce critical infrastructure",
-            "📊 Real-time impact assessment",
-            "🔍 Enhanced observation protocols"
-        ],
-        "HIGH": [
-            "🔶 Regional alert system activation",
-            "🏠 Review evacuation plans",
-            "📱 Public awareness campaign",
-            "🔬 Scientific monitoring intensified"
-        ]
-    }
+USER_RISK_SCORE_THRESHOLDS = np.array([20, 40, 60, 80])
+USER_RISK_LEVEL_ARRAY = np.array(["LOW", "MEDIUM", "HIGH", "VERY_HIGH", "EXTREME"], dtype=object)
+
+def _cap_score(scores: np.ndarray) -> np.ndarray:
+    """Elementwise min(100, score) with the scalar's semantics: Python's min keeps
+    100 for NaN, where np.minimum would propagate it (and digitize calls NaN EXTREME)"""
+    return np.where(scores < 100, scores, 100.0)
+
+def _round_scores(scores: np.ndarray) -> List[float]:
+    """round(score, 1) per element; np.round rounds halves differently (0.05 -> 0.0)"""
+    return [round(score, 1) for score in scores.tolist()]
+
+def calculate_user_risk_assessment_batch(diameters: np.ndarray, velocities: np.ndarray, energies: np.ndarray,
+                                         lats: np.ndarray, lngs: np.ndarray) -> pd.DataFrame:
+    """calculate_user_risk_assessment scores for many scenarios at once, one row per scenario"""
+    diameters = np.asarray(diameters, dtype=float)
+    velocities = np.asarray(velocities, dtype=float)
+    energies = np.asarray(energies, dtype=float)
+    is_ocean = location_analyzer.is_ocean_location_bulk(
+        np.asarray(lats, dtype=float), np.asarray(lngs, dtype=float)
+    )
     
-    default_response = ["✅ Standard monitoring procedures", "📝 Regular risk assessment updates"]
+    size_score = _cap_score(diameters * 10)
+    velocity_score = _cap_score(velocities * 1.5)
+    energy_score = _cap_score(energies / 10)
+    total_score = (size_score * 0.3) + (velocity_score * 0.2) + (energy_score * 0.5)
     
-    return responses.get(risk_level, default_response)
+    ocean_boost = is_ocean & (energies > 10)
+    total_score = np.where(ocean_boost, _cap_score(total_score * 1.2), total_score)
+    
+    return pd.DataFrame({
+        "risk_score": _round_scores(total_score),
+        "risk_level": USER_RISK_LEVEL_ARRAY[np.digitize(total_score, USER_RISK_SCORE_THRESHOLDS)],
+        "size_risk": _round_scores(size_score),
+        "velocity_risk": _round_scores(velocity_score),
+        "energy_risk": _round_scores(energy_score),
+        "location_risk": np.where(ocean_boost, "HIGH", "MEDIUM").astype(object),
+        "is_ocean": is_ocean
+    })
+
+USER_EMERGENCY_RESPONSES = {
+    "EXTREME": (
+        "🚨 IMMEDIATE GLOBAL ALERT - Evacuation required",
+        "🌍 International cooperation essential",
+        "📡 Continuous monitoring and trajectory updates",
+        "🏥 Activate emergency medical response worldwide"
+    ),
+    "VERY_HIGH": (
+        "⚠️ High-priority alert to affected regions",
+        "🏗️ Reinforce critical infrastructure",
+        "📊 Real-time impact assessment",
+        "🔍 Enhanced observation protocols"
+    ),
+    "HIGH": (
+        "🔶 Regional alert system activation",
+        "🏠 Review evacuation plans",
+        "📱 Public awareness campaign",
+        "🔬 Scientific monitoring intensified"
+    )
+}
+USER_EMERGENCY_DEFAULT_RESPONSE = ("✅ Standard monitoring procedures", "📝 Regular risk assessment updates")
+
+def generate_user_emergency_response(risk_level: str, energy: float, is_ocean: bool):
+    """Generate emergency response for user scenario (shared tuple)"""
+    return USER_EMERGENCY_RESPONSES.get(risk_level, USER_EMERGENCY_DEFAULT_RESPONSE)
+
+# Upper diameter bounds (km, exclusive) of the first three feasibility rows
+MISSION_FEASIBILITY_DIAMETER_THRESHOLDS = (0.1, 0.5, 2.0)
+MISSION_FEASIBILITY = (
+    {
+        "feasibility": "VERY_HIGH",
+        "timeframe": "1-3 years",
+        "cost_estimate": "Low ($100M - $500M)",
+        "success_probability": "85-95%"
+    },
+    {
+        "feasibility": "HIGH", 
+        "timeframe": "3-7 years",
+        "cost_estimate": "Medium ($500M - $2B)",
+        "success_probability": "70-85%"
+    },
+    {
+        "feasibility": "MEDIUM",
+        "timeframe": "7-15 years", 
+        "cost_estimate": "High ($2B - $10B)",
+        "success_probability": "50-70%"
+    },
+    {
+        "feasibility": "LOW",
+        "timeframe": "15-25 years",
+        "cost_estimate": "Very High ($10B+)",
+        "success_probability": "30-50%"
+    }
+)
 
 def assess_mission_feasibility(diameter: float, energy: float):
-    """Assess mission feasibility for defense strategies"""
-    if diameter < 0.1:
-        return {
-            "feasibility": "VERY_HIGH",
-            "timeframe": "1-3 years",
-            "cost_estimate": "Low ($100M - $500M)",
-            "success_probability": "85-95%"
-        }
-    elif diameter < 0.5:
-        return {
-            "feasibility": "HIGH", 
-            "timeframe": "3-7 years",
-            "cost_estimate": "Medium ($500M - $2B)",
-            "success_probability": "70-85%"
-        }
-    elif diameter < 2.0:
-        return {
-            "feasibility": "MEDIUM",
-            "timeframe": "7-15 years", 
-            "cost_estimate": "High ($2B - $10B)",
-            "success_probability": "50-70%"
-        }
-    else:
-        return {
-            "feasibility": "LOW",
-            "timeframe": "15-25 years",
-            "cost_estimate": "Very High ($10B+)",
-            "success_probability": "30-50%"
-        }
+    """Assess mission feasibility for defense strategies (shared prebuilt dict, do not mutate)"""
+    return MISSION_FEASIBILITY[bisect.bisect_right(MISSION_FEASIBILITY_DIAMETER_THRESHOLDS, diameter)]
+
+IMPACT_LOCATION_SUGGESTIONS = {
+    "cities": [
+        {"name": "New York, USA", "lat": 40.7128, "lng": -74.0060},
+        {"name": "Tokyo, Japan", "lat": 35.6762, "lng": 139.6503},
+        {"name": "London, UK", "lat": 51.5074, "lng": -0.1278},
+        {"name": "Sydney, Australia", "lat": -33.8688, "lng": 151.2093},
+        {"name": "Pacific Ocean", "lat": 0, "lng": -160},
+        {"name": "Atlantic Ocean", "lat": 30, "lng": -40},
+        {"name": "Sahara Desert", "lat": 23, "lng": 13},
+        {"name": "Himalayan Mountains", "lat": 28, "lng": 87}
+    ]
+}
+# Static payload: serialized once and served as raw bytes
+IMPACT_LOCATION_SUGGESTIONS_JSON = orjson.dumps(IMPACT_LOCATION_SUGGESTIONS)
 
 @app.get("/user/impact-locations/suggestions")
 async def get_impact_location_suggestions():
     """Get suggested impact locations for testing"""
-    return {
-        "cities": [
-            {"name": "New York, USA", "lat": 40.7128, "lng": -74.0060},
-            {"name": "Tokyo, Japan", "lat": 35.6762, "lng": 139.6503},
-            {"name": "London, UK", "lat": 51.5074, "lng": -0.1278},
-            {"name": "Sydney, Australia", "lat": -33.8688, "lng": 151.2093},
-            {"name": "Pacific Ocean", "lat": 0, "lng": -160},
-            {"name": "Atlantic Ocean", "lat": 30, "lng": -40},
-            {"name": "Sahara Desert", "lat": 23, "lng": 13},
-            {"name": "Himalayan Mountains", "lat": 28, "lng": 87}
-        ]
-    }
+    return Response(content=IMPACT_LOCATION_SUGGESTIONS_JSON, media_type="application/json")
 
     # ترتيب حسب مستوى التهديد ثم الوقت المتوقع
     predicted_threats.sort(key=lambda x: (
@@ -1858,7 +1712,7 @@ def calculate_time_to_impact(distance_km, velocity_km_s, max_years):
     """
     حساب الوقت المتوقع للوصول إلى الأرض
     """
-    distance_au = distance_km / 149597870.7  # التحويل للوحدة الفلكية
+    distance_au = distance_km * INV_AU_KM  # التحويل للوحدة الفلكية
     
     # حساب الوقت بناءً على المسافة والسرعة (تبسيط)
     if distance_au <= 0.1:  # قريب جداً
@@ -1883,7 +1737,7 @@ def calculate_time_to_impact(distance_km, velocity_km_s, max_years):
     """
     try:
         # التحويل للوحدة الفلكية
-        distance_au = distance_km / 149597870.7
+        distance_au = distance_km * INV_AU_KM
         
         # حساب الوقت بناءً على المسافة والسرعة (نموذج مبسط)
         if distance_au <= 0.05:  # قريب جداً
@@ -1999,7 +1853,7 @@ def analyze_threat_breakdown(threats):
                 'average_diameter_km': round(avg_diameter, 2),
                 'average_energy_megatons': round(avg_energy, 2),
                 'closest_approach_years': round(closest_approach, 1),
-                'most_common_threat_level': max(breakdown.items(), key=lambda x: x[1])[0] if total_threats > 0 else "NONE"
+                'most_common_threat_level': max(breakdown.items(), key=COUNT_KEY)[0] if total_threats > 0 else "NONE"
             },
             'risk_assessment': assess_collective_risk(threats)
         }
@@ -2019,7 +1873,7 @@ def assess_collective_risk(threats):
     
     critical_count = sum(1 for t in threats if t['threat_category']['level'] == 'CRITICAL')
     high_count = sum(1 for t in threats if t['threat_category']['level'] == 'HIGH')
-    total_energy = sum(t['energy_megatons_TNT'] for t in threats)
+    total_energy = sum(map(ENERGY_KEY, threats))
     
     if critical_count >= 3 or total_energy > 1000:
         return "EXTREME"
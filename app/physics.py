@@ -1,11 +1,12 @@
-import numpy as np
+import math
+from app.constants import INV_AU_KM
 
 class AsteroidPhysics:
     @staticmethod
     def calculate_mass(diameter_m: float, density=2600) -> float:
         """حساب الكتلة (kg)"""
         radius_m = diameter_m / 2
-        volume_m3 = (4/3) * np.pi * (radius_m ** 3)
+        volume_m3 = (4/3) * math.pi * (radius_m ** 3)
         return volume_m3 * density
     
     @staticmethod
@@ -33,13 +34,13 @@ class AsteroidPhysics:
             'crater_diameter_km': crater_diameter_km,
             'destruction_radius_km': destruction_radius_km,
             'shock_wave_velocity_km_s': shock_wave_velocity_km_s,
-            'affected_area_km2': np.pi * (destruction_radius_km ** 2)
+            'affected_area_km2': math.pi * (destruction_radius_km ** 2)
         }
     
     @staticmethod
     def classify_hazard(diameter_m: float, distance_km: float, energy_mt: float) -> str:
         """تصنيف مستوى الخطورة"""
-        distance_au = distance_km / 149597870.7
+        distance_au = distance_km * INV_AU_KM
         
         if diameter_m >= 1000 and distance_au < 0.05:
             return "EXTINCTION_LEVEL"
@@ -1,5 +1,6 @@
 # app/quantum_analyzer.py - ملف جديد نظيف
 import numpy as np
+from app.constants import INV_AU_KM
 from typing import Dict
 
 class QuantumAsteroidAnalyzer:
@@ -48,7 +49,7 @@ class QuantumAsteroidAnalyzer:
     
     def distance_to_quantum_state(self, distance: float) -> np.ndarray:
         """تحويل المسافة لحالة كمومية"""
-        distance_au = distance / 149597870.7
+        distance_au = distance * INV_AU_KM
         
         if distance_au < 0.05:
             return np.array([0.1, 0.9])
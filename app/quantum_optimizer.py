@@ -8,11 +8,29 @@ for asteroid threats based on cost minimization.
 
 from typing import Dict, List, Tuple, Optional
 from datetime import datetime, timedelta
+from functools import lru_cache
+import copy
 import numpy as np
 import logging
 
 logger = logging.getLogger(__name__)
 
+# Significant digits kept when binning parameters for the solution cache
+SOLVE_CACHE_SIG_DIGITS = 3
+
+
+def _quantize(value: float) -> float:
+    """Round to SOLVE_CACHE_SIG_DIGITS significant digits (a relative-precision bin)"""
+    return float(f"{float(value):.{SOLVE_CACHE_SIG_DIGITS}g}")
+
+
+class _UncachedSolution(Exception):
+    """Carries a failed solve out of the lru_cache so it is not stored"""
+
+    def __init__(self, solution: Tuple[str, Dict]):
+        super().__init__()
+        self.solution = solution
+
 try:
     from qiskit import QuantumCircuit
     from qiskit_aer import AerSimulator
@@ -65,6 +83,10 @@ class QuantumDefenseOptimizer:
             self.backend = None
             self.optimizer = None
         
+        # Successful solutions keyed by quantized (mass, velocity, time_to_impact)
+        # so repeat requests for the same parameter bin skip the QAOA setup and solve
+        self._solve_cached = lru_cache(maxsize=1024)(self._solve_for_bin)
+        
     def create_optimization_problem(self, asteroid_params: Dict):
         """
         Create a quadratic program for defense strategy optimization.
@@ -211,9 +233,15 @@ class QuantumDefenseOptimizer:
                 if param not in asteroid_params:
                     raise ValueError(f"Missing required parameter: {param}")
             
-            # Create and solve optimization problem
-            qp = self.create_optimization_problem(asteroid_params)
-            best_strategy, solution_info = self.solve_with_qaoa(qp)
+            # Create and solve optimization problem (cached per parameter bin)
+            try:
+                best_strategy, solution_info = self._solve_cached(
+                    _quantize(asteroid_params["mass"]),
+                    _quantize(asteroid_params["velocity"]),
+                    _quantize(asteroid_params["time_to_impact"])
+                )
+            except _UncachedSolution as failed:
+                best_strategy, solution_info = failed.solution
             
             # Calculate execution time (time_to_impact - 1 day buffer)
             time_to_impact = asteroid_params["time_to_impact"]
@@ -223,7 +251,7 @@ class QuantumDefenseOptimizer:
             return {
                 "best_strategy": best_strategy,
                 "execution_time": execution_time.isoformat() + "Z",
-                "optimization_details": solution_info,
+                "optimization_details": copy.deepcopy(solution_info),
                 "asteroid_parameters": asteroid_params,
                 "strategy_justification": self._get_strategy_justification(
                     best_strategy, asteroid_params
@@ -247,6 +275,28 @@ class QuantumDefenseOptimizer:
                 "strategy_justification": "Fallback to lowest cost strategy due to optimization error"
             }
     
+    def _solve_for_bin(self, mass: float, velocity: float, time_to_impact: float) -> Tuple[str, Dict]:
+        """
+        Build and solve the optimization problem for one quantized parameter bin.
+        
+        Returns:
+            Tuple of (best_strategy, solution_info); the solution dict is shared
+            between cache hits, so callers deep-copy it before handing it out
+            
+        Raises:
+            _UncachedSolution: wrapping the fallback result when the solve failed,
+                so the failure is returned once but never cached
+        """
+        qp = self.create_optimization_problem({
+            "mass": mass,
+            "velocity": velocity,
+            "time_to_impact": time_to_impact
+        })
+        solution = self.solve_with_qaoa(qp)
+        if not solution[1].get("optimization_successful", False):
+            raise _UncachedSolution(solution)
+        return solution
+    
     def _get_strategy_justification(self, strategy: str, asteroid_params: Dict) -> str:
         """
         Provide justification for the selected strategy.
@@ -0,0 +1,25 @@
+import numpy as np
+
+# Upper bounds (inclusive, AU) of the CRITICAL and HIGH bands; anything farther is LOW
+CRITICAL_DISTANCE_AU = 0.01
+HAZARDOUS_DISTANCE_AU = 0.05
+
+THREAT_LEVEL_ARRAY = np.array(["CRITICAL", "HIGH", "LOW"], dtype=object)
+
+
+def classify_threat_scalar(distance_au: float) -> str:
+    """Threat level for one miss distance in AU"""
+    if distance_au <= CRITICAL_DISTANCE_AU:
+        return "CRITICAL"
+    elif distance_au <= HAZARDOUS_DISTANCE_AU:
+        return "HIGH"
+    return "LOW"
+
+
+def classify_threat(distance_au) -> np.ndarray:
+    """classify_threat_scalar over an array of miss distances in AU"""
+    distance_au = np.asarray(distance_au, dtype=float)
+    index = np.select(
+        [distance_au <= CRITICAL_DISTANCE_AU, distance_au <= HAZARDOUS_DISTANCE_AU], [0, 1], 2
+    )
+    return THREAT_LEVEL_ARRAY[index]
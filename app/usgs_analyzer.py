@@ -1,5 +1,5 @@
 import requests
-from typing import List, Dict
+from typing import List, Dict, Tuple
 import time
 
 class USGSAnalyzer:
@@ -10,6 +10,14 @@ class USGSAnalyzer:
     
     def get_earthquakes_near_location(self, lat: float, lng: float, radius_km: float = 500) -> List[Dict]:
         """Get earthquakes near a specific location"""
+        try:
+            return self._query_earthquakes(lat, lng, radius_km)
+        except Exception as e:
+            print(f"Error fetching USGS data: {e}")
+            return []
+    
+    def _query_earthquakes(self, lat: float, lng: float, radius_km: float) -> List[Dict]:
+        """USGS query; network and parsing errors propagate to the caller"""
         params = {
             'format': 'geojson',
             'latitude': lat,
@@ -21,35 +29,44 @@ class USGSAnalyzer:
             'orderby': 'time'
         }
         
-        try:
-            response = requests.get(self.base_url, params=params, timeout=10)
-            data = response.json()
-            
-            earthquakes = []
-            for feature in data.get('features', [])[:20]:
-                props = feature['properties']
-                coords = feature['geometry']['coordinates']
-                
-                earthquakes.append({
-                    'magnitude': props['mag'],
-                    'place': props['place'],
-                    'time': props['time'],
-                    'latitude': coords[1],
-                    'longitude': coords[0],
-                    'depth_km': coords[2],
-                    'tsunami_warning': props.get('tsunami', 0),
-                    'significance': props.get('sig', 0)
-                })
+        response = requests.get(self.base_url, params=params, timeout=10)
+        data = response.json()
+        
+        earthquakes = []
+        for feature in data.get('features', [])[:20]:
+            props = feature['properties']
+            coords = feature['geometry']['coordinates']
             
-            return earthquakes
-        except Exception as e:
-            print(f"Error fetching USGS data: {e}")
-            return []
+            earthquakes.append({
+                'magnitude': props['mag'],
+                'place': props['place'],
+                'time': props['time'],
+                'latitude': coords[1],
+                'longitude': coords[0],
+                'depth_km': coords[2],
+                'tsunami_warning': props.get('tsunami', 0),
+                'significance': props.get('sig', 0)
+            })
+        
+        return earthquakes
     
     def calculate_seismic_risk(self, lat: float, lng: float) -> Dict:
         """Calculate seismic risk for a location"""
-        earthquakes = self.get_earthquakes_near_location(lat, lng, 300)
-        
+        return self.calculate_seismic_risk_checked(lat, lng)[0]
+    
+    def calculate_seismic_risk_checked(self, lat: float, lng: float) -> Tuple[Dict, bool]:
+        """calculate_seismic_risk plus whether the USGS data was actually fetched
+        (a failed fetch is reported as a quiet area, which callers must not cache)"""
+        try:
+            earthquakes = self._query_earthquakes(lat, lng, 300)
+            fetched = True
+        except Exception as e:
+            print(f"Error fetching USGS data: {e}")
+            earthquakes = []
+            fetched = False
+        return self._assess_seismic_risk(earthquakes), fetched
+    
+    def _assess_seismic_risk(self, earthquakes: List[Dict]) -> Dict:
         if not earthquakes:
             return {
                 "risk_level": "low",
@@ -0,0 +1,59 @@
+import math
+
+import numpy as np
+import pandas as pd
+import pytest
+
+from app.database import AsteroidDB
+from app.defense_strategies import defense_strategies, TIME_UNTIL_IMPACT_YEARS
+
+
+def _scalar(distance_au):
+    return defense_strategies.estimate_time_until_impact({"distance_au": distance_au})
+
+
+@pytest.mark.parametrize("distance_au, years", [
+    (0.0, 0.1),
+    (0.01, 0.1),      # thresholds are inclusive upper bounds
+    (0.0100001, 1),
+    (0.05, 1),
+    (0.1, 5),
+    (0.2, 10),
+    (None, 10),       # unknown distance never passes a threshold
+    (math.nan, 10),
+])
+def test_scalar_buckets(distance_au, years):
+    assert _scalar(distance_au) == years
+
+
+def test_batch_matches_scalar_including_missing_distances():
+    distances = [0.0, 0.005, 0.01, 0.03, 0.05, 0.07, 0.1, 0.5, None, math.nan]
+    batch = defense_strategies.estimate_time_until_impact_arr(distances)
+    assert batch.tolist() == [_scalar(d) for d in distances]
+
+
+def test_null_miss_distance_rows_agree(tmp_path):
+    """A row with NULL miss_distance_km gets distance_au NULL (None per row, NaN
+    in the DataFrame); both paths must still bucket it the same way"""
+    csv_path = tmp_path / "asteroids.csv"
+    pd.DataFrame({
+        "id": [1, 2],
+        "name": ["(2024 AA)", "(2024 BB)"],
+        "date": ["2024-01-01", "2024-01-02"],
+        "diameter_avg": [150.0, 300.0],
+        "velocity_km_s": [12.0, 20.0],
+        "miss_distance_km": [1.0e6, np.nan],
+        "energy_megatons_TNT": [10.0, 100.0],
+    }).to_csv(csv_path, index=False)
+
+    db = AsteroidDB(db_path=tmp_path / "asteroids.db")
+    assert db.load_from_csv(csv_path)
+
+    row = db.get_asteroid_by_id(2)
+    assert row["distance_au"] is None
+
+    df = db.get_all_asteroids()
+    batch = defense_strategies.estimate_time_until_impact_arr(df["distance_au"].to_numpy())
+    scalar = [_scalar(db.get_asteroid_by_id(asteroid_id)["distance_au"]) for asteroid_id in df["id"]]
+    assert batch.tolist() == scalar
+    assert scalar[df.index[df["id"] == 2][0]] == TIME_UNTIL_IMPACT_YEARS[-1]